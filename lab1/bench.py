@@ -0,0 +1,214 @@
+# Бенчмарки горячих путей Angle / AngleRange
+#
+#   python lab1/bench.py --output current.json
+#   python lab1/bench.py --baseline baseline.json --threshold 0.15
+#
+# Результат - JSON с лучшим временем (из --repeat прогонов) для каждой пары
+# (бенчмарк, нагрузка, размер). При сравнении с базовым файлом все замеры,
+# ставшие медленнее больше чем на threshold, выводятся, и код возврата равен 1.
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from functools import reduce
+from math import pi
+from typing import Callable
+
+from main import Angle, AngleRange
+
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+WORKLOADS = ["uniform", "wrap"]
+
+
+# Генерация входных данных ========================================
+def make_angles(n: int, rnd: random.Random) -> list[Angle]:
+    return [Angle(rnd.uniform(-4*pi, 4*pi)) for _ in range(n)]
+
+
+def make_ranges(n: int, workload: str, rnd: random.Random) -> list[AngleRange]:
+    ranges = []
+    for _ in range(n):
+        if workload == "wrap":
+            # Почти все промежутки проходят через 0 / 2*pi
+            start = rnd.uniform(3*pi/2, 2*pi)
+            end = rnd.uniform(0, pi/2)
+        else:
+            start = rnd.uniform(0, 2*pi)
+            end = min(start + rnd.uniform(0, pi), 2*pi)
+        ranges.append(AngleRange(start, end, rnd.random() < 0.5, rnd.random() < 0.5))
+    return ranges
+
+
+def make_chain(n: int, workload: str) -> list[AngleRange]:
+    # Соседние промежутки перекрываются, поэтому свертка через + остается одним промежутком
+    step = 2*pi / max(n, 1)
+    offset = 3*pi/2 if workload == "wrap" else 0
+    return [AngleRange(offset + i*step, offset + (i + 2)*step) for i in range(n)]
+
+
+def make_cuts(n: int, workload: str) -> tuple[AngleRange, list[AngleRange]]:
+    # Каждый вырез задевает начало остатка, поэтому после каждого шага свертки через -
+    # остается несколько кусков, а не по куску на вырез
+    step = pi / max(n, 1)
+    offset = 3*pi/2 if workload == "wrap" else 0
+    base = AngleRange(offset, offset + 3*pi/2)
+    return base, [AngleRange(offset + i*step, offset + (i + 2)*step) for i in range(n)]
+
+
+def subtract_all(acc: AngleRange | list[AngleRange], cut: AngleRange) -> list[AngleRange]:
+    parts = []
+    for part in acc if isinstance(acc, list) else [acc]:
+        result = part - cut
+        parts += result if isinstance(result, list) else [result]
+    # __sub__ может вернуть пустые промежутки вида [0, 0) и повторить точку 0 на стыке -
+    # без отсева свертка стала бы квадратичной
+    unique = {}
+    for r in parts:
+        if r.start_point != r.end_point or (r.include_start and r.include_end):
+            unique.setdefault((r.start_point, r.end_point, r.include_start, r.include_end), r)
+    return list(unique.values())
+
+
+# Бенчмарки: по входным параметрам готовят данные и возвращают замеряемую функцию
+def bench_angle_arithmetic(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    angles = make_angles(n, rnd)
+    return lambda: [(a + b) * 2 - a / 3 for a, b in zip(angles, angles[1:])]
+
+
+def bench_angle_compare(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    angles = make_angles(n, rnd)
+    return lambda: [(a < b, a == b) for a, b in zip(angles, angles[1:])]
+
+
+def bench_split_range(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_ranges(n, workload, rnd)
+    return lambda: [r.split_range() for r in ranges]
+
+
+def bench_contains_angle(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_ranges(n, workload, rnd)
+    angles = make_angles(n, rnd)
+    return lambda: [a in r for a, r in zip(angles, ranges)]
+
+
+def bench_contains_range(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_ranges(n, workload, rnd)
+    return lambda: [a in b for a, b in zip(ranges, ranges[1:])]
+
+
+def bench_add_chain(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_chain(n, workload)
+    return lambda: reduce(lambda acc, r: acc + r, ranges)
+
+
+def bench_sub_chain(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    base, cuts = make_cuts(n, workload)
+    return lambda: reduce(subtract_all, cuts, base)
+
+
+def bench_sub_pairs(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_ranges(n, workload, rnd)
+    return lambda: [a - b for a, b in zip(ranges, ranges[1:])]
+
+
+def bench_union_all(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_ranges(n, workload, rnd)
+    return lambda: AngleRange.union_all(ranges)
+
+
+def bench_contains_many(n: int, workload: str, rnd: random.Random) -> Callable[[], object]:
+    ranges = make_ranges(1, workload, rnd)
+    angles = [float(a) for a in make_angles(n, rnd)]
+    return lambda: ranges[0].contains_many(angles)
+
+
+BENCHMARKS = {
+    "angle_arithmetic": bench_angle_arithmetic,
+    "angle_compare": bench_angle_compare,
+    "split_range": bench_split_range,
+    "contains_angle": bench_contains_angle,
+    "contains_range": bench_contains_range,
+    "add_chain": bench_add_chain,
+    "sub_chain": bench_sub_chain,
+    "sub_pairs": bench_sub_pairs,
+    "union_all": bench_union_all,
+    "contains_many": bench_contains_many,
+}
+
+
+# Запуск и сравнение ==============================================
+def run(names: list[str], sizes: list[int], repeat: int, seed: int) -> dict:
+    results = {}
+    for name in names:
+        for workload in WORKLOADS:
+            for n in sizes:
+                fn = BENCHMARKS[name](n, workload, random.Random(seed))
+                best = float("inf")
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    fn()
+                    best = min(best, time.perf_counter() - start)
+                key = f"{name}/{workload}/{n}"
+                results[key] = {"seconds": best, "ns_per_item": best / n * 1e9}
+                print(f"{key:<40} {best:12.6f} s {best / n * 1e9:12.1f} ns/item", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for key, value in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+        old = baseline["results"][key]["seconds"]
+        new = value["seconds"]
+        if old > 0 and new > old * (1 + threshold):
+            regressions.append(f"{key}: {old:.6f} s -> {new:.6f} s (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Angle / AngleRange benchmarks")
+    parser.add_argument("--bench", nargs="*", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--max-size", type=int, default=SIZES[-1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="путь для JSON с результатами (по умолчанию stdout)")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для поиска регрессий")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    sizes = [n for n in SIZES if n <= args.max_size]
+    current = run(args.bench, sizes, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    else:
+        print(json.dumps(current, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for line in regressions:
+            print("REGRESSION", line, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
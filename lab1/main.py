@@ -21,9 +21,17 @@
 # """
 
 
-from math import pi, isclose
+from math import pi, isclose, atan2, hypot
+from bisect import bisect_left, bisect_right
+import heapq
+import os
+import random
+import types
+from concurrent.futures import ProcessPoolExecutor
 from operator import truediv
-from typing import Self
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Self
+from dataclasses import dataclass, replace
+import numpy as np
 # from typing import TypeVar, Type
 
 # T = TypeVar("T", bound="ClassName")
@@ -68,21 +76,33 @@ class Angle:
 
     # Перегрузка операторов сравнения
     def __eq__(self, other: Self) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
         return isclose((self.angle % (2*pi)), (other.angle % (2*pi)))
     
     def __ne__(self, other: Self) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
         return not self.__eq__(other)
     
     def __lt__(self, other: Self) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
         return (self.angle % (2*pi)) < (other.angle % (2*pi))
     
     def __le__(self, other: Self) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
         return self.__lt__(other) or self.__eq__(other)
     
     def __gt__(self, other: Self) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
         return (self.angle % (2*pi)) > (other.angle % (2*pi))
     
     def __ge__(self, other: Self) -> bool:
+        if not isinstance(other, Angle):
+            return NotImplemented
         return self.__gt__(other) or self.__eq__(other) 
     
     # Прегрузка математических операторов
@@ -130,6 +150,146 @@ class Angle:
             return NotImplemented
 
 
+# Неизменяемый компактный угол: нормализуется один раз при создании,
+# равенство и хеш считаются по квантованному значению (TICKS_PER_TURN делений на оборот).
+# Это корзины, а не isclose: углы, округленные к одному делению, равны, но два угла
+# сколь угодно близко по разные стороны от границы деления попадают в разные корзины
+class FrozenAngle:
+    __slots__ = ("_angle", "_ticks")
+
+    TICKS_PER_TURN = 2**33
+
+    def __init__(self, angle: "float | int | Angle | FrozenAngle") -> None:
+        angle = float(angle)
+        ticks = round((angle % (2*pi)) * (self.TICKS_PER_TURN / (2*pi))) % self.TICKS_PER_TURN
+        object.__setattr__(self, "_angle", angle)
+        object.__setattr__(self, "_ticks", ticks)
+
+    @classmethod
+    def from_degree(cls, degree: float) -> Self:
+        return cls(degree * (pi / 180))
+
+    @property
+    def degree(self) -> float:
+        return self._angle * (180 / pi)
+
+    @property
+    def radian(self) -> float:
+        return self._angle
+
+    @property
+    def normalized(self) -> float:
+        return self._ticks * (2*pi / self.TICKS_PER_TURN)
+
+    def to_angle(self) -> Angle:
+        return Angle(self._angle)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self._angle,)
+
+    def __int__(self) -> int:
+        return int(self._angle)
+
+    def __float__(self) -> float:
+        return self._angle
+
+    def __str__(self) -> str:
+        return str(self._angle)
+
+    def __repr__(self) -> str:
+        return f"FrozenAngle({self._angle})"
+
+    def __hash__(self) -> int:
+        return hash(self._ticks)
+
+    # Перегрузка операторов сравнения: FrozenAngle между собой сравниваются по делениям,
+    # с Angle - по правилам Angle (isclose для равенства)
+    def __eq__(self, other: "FrozenAngle | Angle") -> bool:
+        if isinstance(other, FrozenAngle):
+            return self._ticks == other._ticks
+        if isinstance(other, Angle):
+            return self.to_angle() == other
+        return NotImplemented
+
+    def __ne__(self, other: "FrozenAngle | Angle") -> bool:
+        if isinstance(other, FrozenAngle):
+            return self._ticks != other._ticks
+        if isinstance(other, Angle):
+            return self.to_angle() != other
+        return NotImplemented
+
+    def __lt__(self, other: "FrozenAngle | Angle") -> bool:
+        if isinstance(other, FrozenAngle):
+            return self._ticks < other._ticks
+        if isinstance(other, Angle):
+            return self.to_angle() < other
+        return NotImplemented
+
+    def __le__(self, other: "FrozenAngle | Angle") -> bool:
+        if isinstance(other, FrozenAngle):
+            return self._ticks <= other._ticks
+        if isinstance(other, Angle):
+            return self.to_angle() <= other
+        return NotImplemented
+
+    def __gt__(self, other: "FrozenAngle | Angle") -> bool:
+        if isinstance(other, FrozenAngle):
+            return self._ticks > other._ticks
+        if isinstance(other, Angle):
+            return self.to_angle() > other
+        return NotImplemented
+
+    def __ge__(self, other: "FrozenAngle | Angle") -> bool:
+        if isinstance(other, FrozenAngle):
+            return self._ticks >= other._ticks
+        if isinstance(other, Angle):
+            return self.to_angle() >= other
+        return NotImplemented
+
+    # Прегрузка математических операторов
+    def __add__(self, other: "FrozenAngle | Angle | float | int") -> Self:
+        if isinstance(other, (FrozenAngle, Angle, int, float)):
+            return FrozenAngle(self._angle + float(other))
+        return NotImplemented
+
+    def __radd__(self, other: int | float) -> Self:
+        return self.__add__(other)
+
+    def __sub__(self, other: "FrozenAngle | Angle | float | int") -> Self:
+        if isinstance(other, (FrozenAngle, Angle, int, float)):
+            return FrozenAngle(self._angle - float(other))
+        return NotImplemented
+
+    def __rsub__(self, other: int | float) -> Self:
+        if isinstance(other, (Angle, int, float)):
+            return FrozenAngle(float(other) - self._angle)
+        return NotImplemented
+
+    def __mul__(self, other: int | float) -> Self:
+        if isinstance(other, (int, float)):
+            return FrozenAngle(self._angle * other)
+        return NotImplemented
+
+    def __rmul__(self, other: int | float) -> Self:
+        return self.__mul__(other)
+
+    def __truediv__(self, other: int | float) -> Self:
+        if isinstance(other, (int, float)):
+            return FrozenAngle(self._angle / other)
+        return NotImplemented
+
+    def __rtruediv__(self, other: int | float) -> Self:
+        if isinstance(other, (int, float)):
+            return FrozenAngle(other / self._angle)
+        return NotImplemented
+
+
 class AngleRange():
     def __init__(self, start_point: int | float, end_point: int | float, include_start: bool = True, include_end: bool = True) -> None:
         self.start_point    = start_point
@@ -231,7 +391,24 @@ class AngleRange():
 
 
         else:
-            return self.__contains__(Self.from_angle(other))
+            point = _normalize_point(other)
+            return any(_arcs_overlap(arc, (point, True, point, True)) for arc in _range_arcs(self))
+
+    # Векторная проверка in для массива углов в радианах
+    def contains_many(self, angles: "np.ndarray | AngleArray | Iterable[float] | bytes | memoryview") -> np.ndarray:
+        if isinstance(angles, (bytes, bytearray, memoryview)):
+            points = np.frombuffer(angles, dtype=np.float64)
+        else:
+            points = np.asarray(angles, dtype=np.float64)
+        points = points % (2*pi)
+        points = np.where(points >= 2*pi, 0.0, points)
+
+        mask = np.zeros(points.shape, dtype=bool)
+        for s, s_inc, e, e_inc in _range_arcs(self):
+            after_start = (points >= s) if s_inc else (points > s)
+            before_end = (points <= e) if e_inc else (points < e)
+            mask |= after_start & before_end
+        return mask
 
 
     def __add__(self, other: Self) -> list[Self]:
@@ -371,14 +548,1079 @@ class AngleRange():
             return final_ranges[0]
         return final_ranges
 
+    # Массовые операции: каждый промежуток разбивается один раз,
+    # концы сортируются один раз, результат собирается за один проход
+    @classmethod
+    def union_all(cls, ranges: Iterable[Self]) -> Self | list[Self]:
+        return cls._from_range_set(AngleRangeSet(ranges))
+
+    @classmethod
+    def difference_all(cls, base: Self, ranges: Iterable[Self]) -> Self | list[Self]:
+        return cls._from_range_set(AngleRangeSet([base]) - AngleRangeSet(ranges))
+
+    @staticmethod
+    def _from_range_set(range_set: "AngleRangeSet") -> Self | list[Self]:
+        ranges = range_set.to_ranges()
+        if len(ranges) == 1:
+            return ranges[0]
+        return ranges
+
+
+# Векторные операции над массивом углов
+def _isclose_many(a: np.ndarray, b: np.ndarray, rel_tol: float = 1e-09) -> np.ndarray:
+    # Та же формула, что и в math.isclose (симметричная, abs_tol=0)
+    return (a == b) | (np.abs(a - b) <= rel_tol * np.maximum(np.abs(a), np.abs(b)))
+
+
+class AngleArray:
+    __array_ufunc__ = None
+
+    def __init__(self, angles: "np.ndarray | list[float] | AngleArray | Angle | float") -> None:
+        if isinstance(angles, AngleArray):
+            angles = angles.angles
+        elif isinstance(angles, Angle):
+            angles = angles.angle
+        self.angles = np.asarray(angles, dtype=np.float64)
+
+    @classmethod
+    def from_degree(cls, degrees: "np.ndarray | list[float]") -> Self:
+        return cls(np.asarray(degrees, dtype=np.float64) * (pi / 180))
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | bytearray | memoryview, count: int = -1, offset: int = 0) -> Self:
+        return cls(np.frombuffer(buffer, dtype=np.float64, count=count, offset=offset))
+
+    @property
+    def degree(self) -> np.ndarray:
+        return self.angles * (180 / pi)
+
+    @degree.setter
+    def degree(self, angles: "np.ndarray | list[float]") -> None:
+        self.angles = np.asarray(angles, dtype=np.float64) * (pi / 180)
+
+    @property
+    def radian(self) -> np.ndarray:
+        return self.angles
+
+    @radian.setter
+    def radian(self, angles: "np.ndarray | list[float]") -> None:
+        self.angles = np.asarray(angles, dtype=np.float64)
+
+    def normalized(self) -> np.ndarray:
+        return self.angles % (2*pi)
+
+    def __len__(self) -> int:
+        return len(self.angles)
+
+    def __getitem__(self, index) -> "Angle | AngleArray":
+        item = self.angles[index]
+        if np.ndim(item) == 0:
+            return Angle(float(item))
+        return AngleArray(item)
+
+    def __iter__(self):
+        for angle in self.angles:
+            yield Angle(float(angle))
+
+    # Протокол NumPy 2: copy=True - всегда копия, copy=False - без копии или ValueError
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if dtype is None or np.dtype(dtype) == self.angles.dtype:
+            return self.angles.copy() if copy else self.angles
+        if copy is False:
+            raise ValueError(f"AngleArray cannot be converted to {np.dtype(dtype)} without a copy")
+        return self.angles.astype(dtype)
+
+    def __str__(self) -> str:
+        return str(self.angles)
+
+    def __repr__(self) -> str:
+        return f"AngleArray({self.angles.tolist()})"
+
+    # Вспомогательный метод: приведение операнда к массиву радиан
+    @staticmethod
+    def _operand(other) -> np.ndarray | None:
+        if isinstance(other, AngleArray):
+            return other.angles
+        if isinstance(other, Angle):
+            return np.float64(other.angle)
+        if isinstance(other, (int, float, np.number, np.ndarray, list, tuple)):
+            return np.asarray(other, dtype=np.float64)
+        return None
+
+    # Перегрузка операторов сравнения (возвращают булевы маски)
+    def __eq__(self, other) -> np.ndarray:
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return _isclose_many(self.angles % (2*pi), other % (2*pi))
+
+    def __ne__(self, other) -> np.ndarray:
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return ~result
+
+    def __lt__(self, other) -> np.ndarray:
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return (self.angles % (2*pi)) < (other % (2*pi))
+
+    def __le__(self, other) -> np.ndarray:
+        result = self.__lt__(other)
+        if result is NotImplemented:
+            return result
+        return result | self.__eq__(other)
+
+    def __gt__(self, other) -> np.ndarray:
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return (self.angles % (2*pi)) > (other % (2*pi))
+
+    def __ge__(self, other) -> np.ndarray:
+        result = self.__gt__(other)
+        if result is NotImplemented:
+            return result
+        return result | self.__eq__(other)
+
+    __hash__ = None
+
+    # Прегрузка математических операторов
+    def __add__(self, other) -> Self:
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return AngleArray(self.angles + other)
+
+    def __radd__(self, other) -> Self:
+        return self.__add__(other)
+
+    def __sub__(self, other) -> Self:
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return AngleArray(self.angles - other)
+
+    def __rsub__(self, other) -> Self:
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return AngleArray(other - self.angles)
+
+    def __mul__(self, other) -> Self:
+        if isinstance(other, (AngleArray, Angle)):
+            return NotImplemented
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return AngleArray(self.angles * other)
+
+    def __rmul__(self, other) -> Self:
+        return self.__mul__(other)
+
+    def __truediv__(self, other) -> Self:
+        if isinstance(other, (AngleArray, Angle)):
+            return NotImplemented
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return AngleArray(self.angles / other)
+
+    def __rtruediv__(self, other) -> Self:
+        if isinstance(other, (AngleArray, Angle)):
+            return NotImplemented
+        other = self._operand(other)
+        if other is None:
+            return NotImplemented
+        return AngleArray(other / self.angles)
+
+
+# Нормализованные дуги: (start, include_start, end, include_end), 0 <= start <= end <= 2*pi,
+# дуга, доходящая до 2*pi, хранится с исключенным концом, а точка 2*pi - как точка 0
+Arc = tuple[float, bool, float, bool]
+
+
+def _arc_key(arc: Arc) -> tuple[float, bool]:
+    return arc[0], not arc[1]
+
+
+def _arc_nonempty(s: float, s_inc: bool, e: float, e_inc: bool) -> bool:
+    return s < e or (s == e and s_inc and e_inc)
+
+
+def _normalize_arc(s: float, s_inc: bool, e: float, e_inc: bool, turn: float = 2*pi) -> list[Arc]:
+    arcs = []
+    if e >= turn:
+        if e_inc and (s < turn or s_inc):
+            arcs.append((0, True, 0, True))
+        e, e_inc = turn, False
+    if _arc_nonempty(s, s_inc, e, e_inc):
+        arcs.append((s, s_inc, e, e_inc))
+    return arcs
+
+
+def _full_turn_arcs(point: float, include: bool, turn: float = 2*pi) -> list[Arc]:
+    # Полный оборот: точка начала/конца выколота, только если оба конца исключены
+    if include:
+        return [(0, True, turn, False)]
+    return _normalize_arc(0, True, point, False, turn) + _normalize_arc(point, False, turn, False, turn)
+
+
+def _range_arcs(rng: "AngleRange") -> list[Arc]:
+    if (rng.end_point - rng.start_point) % (2*pi) == 0 and rng.start_point != rng.end_point:
+        return _full_turn_arcs(_normalize_point(rng.start_point), rng.include_start or rng.include_end)
+
+    arcs = []
+    for (s, s_inc), (e, e_inc) in rng.split_range():
+        # Шов 2*pi в split_range всегда включен, сама точка 0 приходит из второй части
+        arcs += _normalize_arc(s, s_inc, e, e_inc and e < 2*pi)
+    return arcs
+
+
+# Склейка дуг через 0 / turn обратно в промежутки вида make(start, end, include_start, include_end)
+def _arcs_to_ranges(arcs: list[Arc], make, turn: float = 2*pi) -> list:
+    if not arcs:
+        return []
+    if arcs == [(0, True, turn, False)]:
+        return [make(0, turn, True, True)]
+
+    first, last = arcs[0], arcs[-1]
+    # Окружность без одной точки не склеивается: получился бы вырожденный промежуток
+    if len(arcs) > 1 and first[:2] == (0, True) and last[2:] == (turn, False) and first[2] != last[0]:
+        middle = [make(s, e, s_inc, e_inc) for s, s_inc, e, e_inc in arcs[1:-1]]
+        return middle + [make(last[0], first[2], last[1], first[3])]
+    return [make(s, e, s_inc, e_inc) for s, s_inc, e, e_inc in arcs]
+
 
+# Слияние дуг, отсортированных по _arc_key
+def _merge_arcs(arcs: Iterable[Arc]) -> list[Arc]:
+    merged = []
+    for s, s_inc, e, e_inc in arcs:
+        if merged:
+            cs, cs_inc, ce, ce_inc = merged[-1]
+            if s < ce or (s == ce and (s_inc or ce_inc)):
+                if e > ce or (e == ce and e_inc and not ce_inc):
+                    merged[-1] = (cs, cs_inc, e, e_inc)
+                continue
+        merged.append((s, s_inc, e, e_inc))
+    return merged
+
+
+def _intersect_arcs(a: list[Arc], b: list[Arc]) -> list[Arc]:
+    result = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        a1, a1_inc, a2, a2_inc = a[i]
+        b1, b1_inc, b2, b2_inc = b[j]
+
+        # Начало - более позднее из двух, конец - более ранний
+        if a1 > b1 or (a1 == b1 and not a1_inc):
+            s, s_inc = a1, a1_inc
+        else:
+            s, s_inc = b1, b1_inc
+        if a2 < b2 or (a2 == b2 and not a2_inc):
+            e, e_inc = a2, a2_inc
+        else:
+            e, e_inc = b2, b2_inc
+
+        if _arc_nonempty(s, s_inc, e, e_inc):
+            result.append((s, s_inc, e, e_inc))
+
+        if (a2, a2_inc) < (b2, b2_inc):
+            i += 1
+        elif (a2, a2_inc) > (b2, b2_inc):
+            j += 1
+        else:
+            i += 1
+            j += 1
+    return result
+
+
+def _complement_arcs(arcs: list[Arc], turn: float = 2*pi) -> list[Arc]:
+    result = []
+    gap_start, gap_inc = 0, True
+    for s, s_inc, e, e_inc in arcs:
+        if _arc_nonempty(gap_start, gap_inc, s, not s_inc):
+            result.append((gap_start, gap_inc, s, not s_inc))
+        gap_start, gap_inc = e, not e_inc
+    if _arc_nonempty(gap_start, gap_inc, turn, False):
+        result.append((gap_start, gap_inc, turn, False))
+    return result
+
+
+class AngleRangeSet:
+    def __init__(self, ranges: "Iterable[AngleRange]" = ()) -> None:
+        arcs = []
+        for rng in ranges:
+            arcs += _range_arcs(rng)
+        arcs.sort(key=_arc_key)
+        self._set_arcs(_merge_arcs(arcs))
+
+    @classmethod
+    def _from_arcs(cls, arcs: list[Arc]) -> Self:
+        result = cls.__new__(cls)
+        result._set_arcs(arcs)
+        return result
+
+    @classmethod
+    def _coerce(cls, other: "AngleRangeSet | AngleRange") -> Self:
+        if isinstance(other, AngleRangeSet):
+            return other
+        if isinstance(other, AngleRange):
+            return cls([other])
+        return None
+
+    def _set_arcs(self, arcs: list[Arc]) -> None:
+        self.arcs = arcs
+        self._starts = [arc[0] for arc in arcs]
+
+    # Вспомогательный метод: лежит ли дуга [s, e] целиком в одной из дуг множества
+    def _covers(self, s: float, s_inc: bool, e: float, e_inc: bool) -> bool:
+        idx = bisect_right(self._starts, s) - 1
+        if idx < 0:
+            return False
+        a1, a1_inc, a2, a2_inc = self.arcs[idx]
+        start_check = (a1 < s) or (a1 == s and (a1_inc or not s_inc))
+        end_check = (e < a2) or (e == a2 and (a2_inc or not e_inc))
+        return start_check and end_check
+
+    def __contains__(self, other: "Angle | float | int | AngleRange | AngleRangeSet") -> bool:
+        if isinstance(other, (Angle, int, float)):
+            point = _normalize_point(other)
+            return self._covers(point, True, point, True)
+
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return all(self._covers(*arc) for arc in other.arcs)
+
+    def union(self, other: "AngleRangeSet | AngleRange") -> Self:
+        other = self._coerce(other)
+        return self._from_arcs(_merge_arcs(heapq.merge(self.arcs, other.arcs, key=_arc_key)))
+
+    def intersection(self, other: "AngleRangeSet | AngleRange") -> Self:
+        other = self._coerce(other)
+        return self._from_arcs(_intersect_arcs(self.arcs, other.arcs))
+
+    def difference(self, other: "AngleRangeSet | AngleRange") -> Self:
+        other = self._coerce(other)
+        return self._from_arcs(_intersect_arcs(self.arcs, _complement_arcs(other.arcs)))
+
+    def complement(self) -> Self:
+        return self._from_arcs(_complement_arcs(self.arcs))
+
+    def __add__(self, other: "AngleRangeSet | AngleRange") -> Self:
+        if self._coerce(other) is None:
+            return NotImplemented
+        return self.union(other)
+
+    __or__ = __add__
+
+    def __sub__(self, other: "AngleRangeSet | AngleRange") -> Self:
+        if self._coerce(other) is None:
+            return NotImplemented
+        return self.difference(other)
+
+    def __and__(self, other: "AngleRangeSet | AngleRange") -> Self:
+        if self._coerce(other) is None:
+            return NotImplemented
+        return self.intersection(other)
+
+    def __invert__(self) -> Self:
+        return self.complement()
+
+    def __eq__(self, other: "AngleRangeSet | AngleRange") -> bool:
+        other = self._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self.arcs == other.arcs
+
+    def __ne__(self, other: "AngleRangeSet | AngleRange") -> bool:
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __abs__(self) -> float:
+        return sum(e - s for s, _, e, _ in self.arcs)
+
+    def __len__(self) -> int:
+        return len(self.arcs)
+
+    def __bool__(self) -> bool:
+        return bool(self.arcs)
+
+    def __iter__(self):
+        for s, s_inc, e, e_inc in self.arcs:
+            yield AngleRange(s, e, s_inc, e_inc)
+
+    # Промежутки с дугами, склеенными через 0 / 2*pi
+    def to_ranges(self) -> list[AngleRange]:
+        return _arcs_to_ranges(self.arcs, AngleRange)
+
+    def __repr__(self) -> str:
+        return f"AngleRangeSet({self.to_ranges()})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+def _normalize_point(angle: "Angle | float | int") -> float:
+    point = float(angle) % (2*pi)
+    # Отрицательные значения около нуля после % могут дать ровно 2*pi
+    return 0 if point >= 2*pi else point
+
+
+def _arcs_overlap(a: Arc, b: Arc) -> bool:
+    a1, a1_inc, a2, a2_inc = a
+    b1, b1_inc, b2, b2_inc = b
+    if a1 > b1 or (a1 == b1 and not a1_inc):
+        s, s_inc = a1, a1_inc
+    else:
+        s, s_inc = b1, b1_inc
+    if a2 < b2 or (a2 == b2 and not a2_inc):
+        e, e_inc = a2, a2_inc
+    else:
+        e, e_inc = b2, b2_inc
+    return _arc_nonempty(s, s_inc, e, e_inc)
+
+
+# Декартово дерево дуг по началу с поддержкой максимального конца в поддереве
+class _IndexNode:
+    __slots__ = ("key", "arc", "handle", "priority", "max_end", "left", "right")
+
+    def __init__(self, arc: Arc, handle: int) -> None:
+        self.key = (arc[0], not arc[1], handle)
+        self.arc = arc
+        self.handle = handle
+        self.priority = random.random()
+        self.max_end = arc[2]
+        self.left = None
+        self.right = None
+
+    def update(self) -> None:
+        max_end = self.arc[2]
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+def _treap_split(node: _IndexNode | None, key: tuple) -> tuple[_IndexNode | None, _IndexNode | None]:
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _treap_split(node.right, key)
+        node.right = left
+        node.update()
+        return node, right
+    left, right = _treap_split(node.left, key)
+    node.left = right
+    node.update()
+    return left, node
+
+
+def _treap_merge(left: _IndexNode | None, right: _IndexNode | None) -> _IndexNode | None:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _treap_merge(left.right, right)
+        left.update()
+        return left
+    right.left = _treap_merge(left, right.left)
+    right.update()
+    return right
+
+
+def _treap_insert(node: _IndexNode | None, new: _IndexNode) -> _IndexNode:
+    if node is None:
+        return new
+    if new.priority > node.priority:
+        new.left, new.right = _treap_split(node, new.key)
+        new.update()
+        return new
+    if new.key < node.key:
+        node.left = _treap_insert(node.left, new)
+    else:
+        node.right = _treap_insert(node.right, new)
+    node.update()
+    return node
+
+
+def _treap_delete(node: _IndexNode | None, key: tuple) -> _IndexNode | None:
+    if node is None:
+        raise KeyError(key)
+    if key < node.key:
+        node.left = _treap_delete(node.left, key)
+    elif key > node.key:
+        node.right = _treap_delete(node.right, key)
+    else:
+        return _treap_merge(node.left, node.right)
+    node.update()
+    return node
+
+
+class AngleRangeIndex:
+    def __init__(self, ranges: Iterable[AngleRange] = ()) -> None:
+        self._root: _IndexNode | None = None
+        self._ranges: dict[int, AngleRange] = {}
+        self._arcs: dict[int, list[Arc]] = {}
+        self._next_handle = 0
+        for rng in ranges:
+            self.insert(rng)
+
+    def insert(self, rng: AngleRange) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+
+        arcs = _range_arcs(rng)
+        for arc in arcs:
+            self._root = _treap_insert(self._root, _IndexNode(arc, handle))
+        self._ranges[handle] = rng
+        self._arcs[handle] = arcs
+        return handle
+
+    def remove(self, handle: int) -> AngleRange:
+        rng = self._ranges.pop(handle)
+        for arc in self._arcs.pop(handle):
+            self._root = _treap_delete(self._root, (arc[0], not arc[1], handle))
+        return rng
+
+    def __getitem__(self, handle: int) -> AngleRange:
+        return self._ranges[handle]
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def items(self):
+        return self._ranges.items()
+
+    # Вспомогательный метод: дескрипторы всех дуг, пересекающихся с arc
+    def _query(self, arc: Arc) -> set[int]:
+        start, end = arc[0], arc[2]
+        found = set()
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_end < start:
+                continue
+            stack.append(node.left)
+            if node.arc[0] <= end:
+                if _arcs_overlap(node.arc, arc):
+                    found.add(node.handle)
+                stack.append(node.right)
+        return found
+
+    def _result(self, handles: set[int]) -> list[AngleRange]:
+        return [self._ranges[handle] for handle in sorted(handles)]
+
+    def stab_handles(self, angle: Angle | float | int) -> list[int]:
+        point = _normalize_point(angle)
+        return sorted(self._query((point, True, point, True)))
+
+    def stab(self, angle: Angle | float | int) -> list[AngleRange]:
+        point = _normalize_point(angle)
+        return self._result(self._query((point, True, point, True)))
+
+    def stab_many(self, angles: "Iterable[float] | np.ndarray | AngleArray") -> list[list[AngleRange]]:
+        points = np.asarray(angles, dtype=np.float64) % (2*pi)
+        points[points >= 2*pi] = 0
+        return [self._result(self._query((point, True, point, True))) for point in points.tolist()]
+
+    def overlapping(self, rng: AngleRange) -> list[AngleRange]:
+        handles = set()
+        for arc in _range_arcs(rng):
+            handles |= self._query(arc)
+        return self._result(handles)
+
+
+# Двоичное угловое представление (BAM): целое число делений на полный оборот,
+# переход через 2*pi - обычное переполнение uint32
+BAM_TURN = 2**32
+BAM_MASK = BAM_TURN - 1
+
+
+def _to_ticks(angle: "BamAngle | Angle | float | int") -> int:
+    if isinstance(angle, BamAngle):
+        return angle.ticks
+    return round(float(angle) * (BAM_TURN / (2*pi)))
+
+
+class BamAngle:
+    __slots__ = ("ticks",)
+
+    def __init__(self, ticks: int) -> None:
+        self.ticks = int(ticks) & BAM_MASK
+
+    @classmethod
+    def from_radian(cls, radian: float) -> Self:
+        return cls(_to_ticks(radian))
+
+    @classmethod
+    def from_degree(cls, degree: float) -> Self:
+        return cls(round(degree * (BAM_TURN / 360)))
+
+    @property
+    def radian(self) -> float:
+        return self.ticks * (2*pi / BAM_TURN)
+
+    @property
+    def degree(self) -> float:
+        return self.ticks * (360 / BAM_TURN)
+
+    def __int__(self) -> int:
+        return int(self.radian)
+
+    def __float__(self) -> float:
+        return self.radian
 
+    def __str__(self) -> str:
+        return str(self.radian)
+
+    def __repr__(self) -> str:
+        return f"BamAngle({self.ticks})"
 
+    def __hash__(self) -> int:
+        return hash(self.ticks)
+
+    # Перегрузка операторов сравнения: точное сравнение делений
+    def __eq__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngle):
+            return NotImplemented
+        return self.ticks == other.ticks
 
+    def __ne__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngle):
+            return NotImplemented
+        return self.ticks != other.ticks
 
+    def __lt__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngle):
+            return NotImplemented
+        return self.ticks < other.ticks
+
+    def __le__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngle):
+            return NotImplemented
+        return self.ticks <= other.ticks
+
+    def __gt__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngle):
+            return NotImplemented
+        return self.ticks > other.ticks
+
+    def __ge__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngle):
+            return NotImplemented
+        return self.ticks >= other.ticks
 
+    # Прегрузка математических операторов (float и int считаются радианами)
+    def __add__(self, other: "Self | Angle | float | int") -> Self:
+        if isinstance(other, (BamAngle, Angle, int, float)):
+            return BamAngle(self.ticks + _to_ticks(other))
+        return NotImplemented
 
-def test_add():
+    def __radd__(self, other: int | float) -> Self:
+        return self.__add__(other)
+
+    def __sub__(self, other: "Self | Angle | float | int") -> Self:
+        if isinstance(other, (BamAngle, Angle, int, float)):
+            return BamAngle(self.ticks - _to_ticks(other))
+        return NotImplemented
+
+    def __rsub__(self, other: int | float) -> Self:
+        if isinstance(other, (Angle, int, float)):
+            return BamAngle(_to_ticks(other) - self.ticks)
+        return NotImplemented
+
+    def __mul__(self, other: int | float) -> Self:
+        if isinstance(other, (int, float)):
+            return BamAngle(round(self.ticks * other))
+        return NotImplemented
+
+    def __rmul__(self, other: int | float) -> Self:
+        return self.__mul__(other)
+
+    # Деление работает с уже приведенным к [0, 2*pi) значением
+    def __truediv__(self, other: int | float) -> Self:
+        if isinstance(other, (int, float)):
+            return BamAngle(round(self.ticks / other))
+        return NotImplemented
+
+
+class BamAngleRange:
+    def __init__(self, start_point: "BamAngle | Angle | float | int", end_point: "BamAngle | Angle | float | int", include_start: bool = True, include_end: bool = True) -> None:
+        # Концы хранятся в делениях без приведения по модулю, чтобы отличать полный оборот от точки
+        self.start = _to_ticks(start_point)
+        self.end = _to_ticks(end_point)
+        self.include_start = include_start
+        self.include_end = include_end
+
+    @classmethod
+    def from_ticks(cls, start: int, end: int, include_start: bool = True, include_end: bool = True) -> Self:
+        result = cls(0, 0, include_start, include_end)
+        result.start = start
+        result.end = end
+        return result
+
+    @property
+    def start_point(self) -> float:
+        return self.start * (2*pi / BAM_TURN)
+
+    @property
+    def end_point(self) -> float:
+        return self.end * (2*pi / BAM_TURN)
+
+    @property
+    def span(self) -> int:
+        start, end = self.start & BAM_MASK, self.end & BAM_MASK
+        if start == end and self.start != self.end:
+            return BAM_TURN
+        return (end - start) & BAM_MASK
+
+    def arcs(self) -> list[Arc]:
+        start, end = self.start & BAM_MASK, self.end & BAM_MASK
+        if start == end and self.start != self.end:
+            return _full_turn_arcs(start, self.include_start or self.include_end, BAM_TURN)
+        if start <= end:
+            return _normalize_arc(start, self.include_start, end, self.include_end, BAM_TURN)
+        return _normalize_arc(0, True, end, self.include_end, BAM_TURN) + \
+            _normalize_arc(start, self.include_start, BAM_TURN, False, BAM_TURN)
+
+    @classmethod
+    def _from_arcs(cls, arcs: list[Arc]) -> Self | list[Self]:
+        ranges = _arcs_to_ranges(arcs, cls.from_ticks, BAM_TURN)
+        if len(ranges) == 1:
+            return ranges[0]
+        return ranges
+
+    def __abs__(self) -> float:
+        return self.span * (2*pi / BAM_TURN)
+
+    def __eq__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngleRange):
+            return NotImplemented
+        return self.arcs() == other.arcs()
+
+    def __ne__(self, other: Self) -> bool:
+        if not isinstance(other, BamAngleRange):
+            return NotImplemented
+        return self.arcs() != other.arcs()
+
+    __hash__ = None
+
+    def __lt__(self, other: Self) -> bool:
+        return self.span < other.span
+
+    def __le__(self, other: Self) -> bool:
+        return self.__lt__(other) or self.__eq__(other)
+
+    def __gt__(self, other: Self) -> bool:
+        return self.span > other.span
+
+    def __ge__(self, other: Self) -> bool:
+        return self.__gt__(other) or self.__eq__(other)
+
+    def __repr__(self) -> str:
+        open_bracket = "[" if self.include_start else "("
+        close_bracket = "]" if self.include_end else ")"
+        return f"BamAngleRange({open_bracket}{self.start_point}, {self.end_point}{close_bracket})"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+    # Проверка in
+    def __contains__(self, other: "Self | BamAngle | Angle | float | int") -> bool:
+        if isinstance(other, BamAngleRange):
+            return not _intersect_arcs(other.arcs(), _complement_arcs(self.arcs(), BAM_TURN))
+        point = _to_ticks(other) & BAM_MASK
+        return any(_arcs_overlap(arc, (point, True, point, True)) for arc in self.arcs())
+
+    # Векторная проверка для массива делений: смещение от начала считается в uint32 с переполнением
+    def contains_ticks(self, ticks: np.ndarray) -> np.ndarray:
+        ticks = np.asarray(ticks, dtype=np.uint32)
+        start = self.start & BAM_MASK
+        if self.span == BAM_TURN:
+            if self.include_start or self.include_end:
+                return np.ones(ticks.shape, dtype=bool)
+            return ticks != np.uint32(start)
+
+        span = np.uint32(self.span)
+        offset = ticks - np.uint32(start)
+        mask = offset <= span
+        if not self.include_start:
+            mask &= offset != 0
+        if not self.include_end:
+            mask &= offset != span
+        return mask
+
+    def contains_many(self, angles: "np.ndarray | AngleArray | Iterable[float]") -> np.ndarray:
+        radians = np.asarray(angles, dtype=np.float64)
+        ticks = np.round(radians * (BAM_TURN / (2*pi))).astype(np.int64).astype(np.uint32)
+        return self.contains_ticks(ticks)
+
+    def __add__(self, other: Self) -> Self | list[Self]:
+        if not isinstance(other, BamAngleRange):
+            return NotImplemented
+        arcs = heapq.merge(self.arcs(), other.arcs(), key=_arc_key)
+        return self._from_arcs(_merge_arcs(arcs))
+
+    def __sub__(self, other: Self) -> Self | list[Self]:
+        if not isinstance(other, BamAngleRange):
+            return NotImplemented
+        return self._from_arcs(_intersect_arcs(self.arcs(), _complement_arcs(other.arcs(), BAM_TURN)))
+
+
+# Потоковая классификация углов по секторам с накопительной круговой статистикой
+@dataclass
+class SectorStats:
+    count: int = 0
+    sum_cos: float = 0.0
+    sum_sin: float = 0.0
+
+    def add(self, count: int, sum_cos: float, sum_sin: float) -> None:
+        self.count += count
+        self.sum_cos += sum_cos
+        self.sum_sin += sum_sin
+
+    @property
+    def mean(self) -> Angle | None:
+        if self.count == 0:
+            return None
+        return Angle(atan2(self.sum_sin, self.sum_cos) % (2*pi))
+
+    @property
+    def resultant_length(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return hypot(self.sum_cos, self.sum_sin) / self.count
+
+    @property
+    def variance(self) -> float:
+        return 1.0 - self.resultant_length
+
+
+@dataclass
+class ClassifiedChunk:
+    angles: np.ndarray
+    membership: np.ndarray              # (число секторов, число углов)
+    stats: list[SectorStats]
+    total: SectorStats
+
+    def records(self) -> Iterator[tuple[float, list[int]]]:
+        for column, angle in enumerate(self.angles.tolist()):
+            yield angle, np.flatnonzero(self.membership[:, column]).tolist()
+
+
+class AngleStreamClassifier:
+    def __init__(self, sectors: Iterable[AngleRange]) -> None:
+        self.sectors = list(sectors)
+        self.stats = [SectorStats() for _ in self.sectors]
+        self.total = SectorStats()
+
+    def process(self, chunk: "np.ndarray | AngleArray | Iterable[float]") -> ClassifiedChunk:
+        angles = np.asarray(chunk, dtype=np.float64).ravel()
+        membership = np.empty((len(self.sectors), len(angles)), dtype=bool)
+        for i, sector in enumerate(self.sectors):
+            membership[i] = sector.contains_many(angles)
+
+        cos, sin = np.cos(angles), np.sin(angles)
+        counts = membership.sum(axis=1).tolist()
+        sums_cos = (membership @ cos).tolist()
+        sums_sin = (membership @ sin).tolist()
+        for stats, count, sum_cos, sum_sin in zip(self.stats, counts, sums_cos, sums_sin):
+            stats.add(count, sum_cos, sum_sin)
+        self.total.add(len(angles), float(cos.sum()), float(sin.sum()))
+
+        return ClassifiedChunk(angles, membership, [replace(stats) for stats in self.stats], replace(self.total))
+
+    def classify(self, chunks: Iterable) -> Iterator[ClassifiedChunk]:
+        for chunk in chunks:
+            yield self.process(chunk)
+
+    async def aclassify(self, chunks: AsyncIterable) -> AsyncIterator[ClassifiedChunk]:
+        async for chunk in chunks:
+            yield self.process(chunk)
+
+
+# Шардированная алгебра промежутков: окружность делится на shards секторов, соседние секторы
+# объединяются в группы по числу процессов. Родитель раскладывает по группам исходные промежутки,
+# каждый процесс сам разбивает их на дуги, обрезает по своим секторам и считает результат -
+# дуги пересекают границу процессов один раз, на обратном пути
+# Дуги уже отсортированы и не пересекаются: сектору достается срез списка,
+# обрезать нужно только крайние дуги среза
+def _clip_to_shards(arcs: list[Arc], bounds: list[float]) -> list[list[Arc]]:
+    starts = [arc[0] for arc in arcs]
+    shards = []
+    for k in range(len(bounds) - 1):
+        lo, hi = bounds[k], bounds[k + 1]
+        first = max(bisect_right(starts, lo) - 1, 0)
+        last = bisect_left(starts, hi)
+        shard = arcs[first:last]
+        for idx in {0, len(shard) - 1} if shard else ():
+            s, s_inc, e, e_inc = shard[idx]
+            cs, cs_inc = (lo, True) if s < lo else (s, s_inc)
+            ce, ce_inc = (hi, False) if e >= hi else (e, e_inc)
+            shard[idx] = (cs, cs_inc, ce, ce_inc) if _arc_nonempty(cs, cs_inc, ce, ce_inc) else None
+        shards.append([arc for arc in shard if arc is not None] if None in shard else shard)
+    return shards
+
+
+# Дуги сливаются до обрезки: обрезать приходится уже объединенные, отсортированные дуги,
+# и каждый сектор получается сразу отсортированным и слитым
+def _shard_arcs(items: list[tuple], bounds: list[float]) -> list[list[Arc]]:
+    arcs = []
+    for start, end, include_start, include_end in items:
+        arcs += _range_arcs(AngleRange(start, end, include_start, include_end))
+    arcs.sort(key=_arc_key)
+    return _clip_to_shards(_merge_arcs(arcs), bounds)
+
+
+# Группа секторов целиком: объединение base или, если задан other, разность base - other
+def _shard_group(args: tuple[list[tuple], list[tuple] | None, list[float]]) -> list[Arc]:
+    base, other, bounds = args
+    base_shards = _shard_arcs(base, bounds)
+    result = []
+    if other is None:
+        for shard in base_shards:
+            result += shard
+        return result
+    other_shards = _shard_arcs(other, bounds)
+    for base_arcs, other_arcs in zip(base_shards, other_shards):
+        result += _intersect_arcs(base_arcs, _complement_arcs(other_arcs))
+    return result
+
+
+class ShardedRangeEngine:
+    def __init__(self, shards: int = 16, workers: int | None = None) -> None:
+        self.shards = shards
+        self.workers = workers or os.cpu_count() or 1
+        self.bounds = [k * (2*pi) / shards for k in range(shards)] + [2*pi]
+        groups = min(self.workers, shards)
+        cuts = [g * shards // groups for g in range(groups + 1)]
+        self.groups = [self.bounds[cuts[g]:cuts[g + 1] + 1] for g in range(groups)]
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    # Раскладка исходных промежутков по группам секторов: промежуток уходит во все группы,
+    # которые он задевает (проверки нестрогие, лишний промежуток просто обрежется в процессе)
+    def _route(self, ranges: Iterable[AngleRange]) -> list[list[tuple]]:
+        items = [(r.start_point, r.end_point, r.include_start, r.include_end) for r in ranges]
+        if len(self.groups) == 1:
+            return [items]
+        if not items:
+            return [[] for _ in self.groups]
+        starts = np.fromiter((item[0] for item in items), dtype=np.float64, count=len(items))
+        ends = np.fromiter((item[1] for item in items), dtype=np.float64, count=len(items))
+
+        # Те же вычисления, что в split_range
+        s, e = starts % (2*pi), ends % (2*pi)
+        full = ((ends - starts) % (2*pi) == 0) & (starts != ends)
+        wrap = s > e
+        # После % около нуля может получиться ровно 2*pi - такая точка попадает в первый сектор
+        seam = (s >= 2*pi) | (e >= 2*pi)
+
+        routed = []
+        for bounds in self.groups:
+            lo, hi = bounds[0], bounds[-1]
+            mask = full | np.where(wrap, (s <= hi) | (e >= lo), (s <= hi) & (e >= lo))
+            if lo == 0:
+                mask |= seam
+            routed.append([items[i] for i in np.flatnonzero(mask)])
+        return routed
+
+    # Склейка: дуги, разрезанные на границе секторов, сливаются обратно
+    @staticmethod
+    def _gather(results: Iterable[list[Arc]]) -> AngleRangeSet:
+        arcs = []
+        for group in results:
+            arcs += group
+        return AngleRangeSet._from_arcs(_merge_arcs(arcs))
+
+    def union(self, ranges: Iterable[AngleRange]) -> AngleRangeSet:
+        jobs = [(items, None, bounds) for items, bounds in zip(self._route(ranges), self.groups)]
+        return self._gather(self._executor.map(_shard_group, jobs))
+
+    def difference(self, base: Iterable[AngleRange], ranges: Iterable[AngleRange]) -> AngleRangeSet:
+        jobs = zip(self._route(base), self._route(ranges), self.groups)
+        return self._gather(self._executor.map(_shard_group, jobs))
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type | None,
+            exc_value: BaseException | None,
+            traceback: types.TracebackType | None
+    ) -> None:
+        self.close()
+
+
+
+
+
+
+
+
+# Сценарии test_add / test_sub в виде данных: аргументы конструктора для a и b
+ADD_CASES = [
+    ((0, pi/2), (pi/3, pi)),
+    ((0, pi), (pi, 3*pi/2)),
+    ((5*pi/3, pi/3), (0, pi/2)),
+    ((pi, 3*pi/2), (0, pi/4)),
+    ((0, 2*pi), (pi/2, pi)),
+]
+SUB_CASES = [
+    ((0, pi), (pi, 2*pi)),
+    ((0, pi, True, True), (0, pi, True, True)),
+    ((0, pi, True, True), (0, pi, False, False)),
+    ((0, pi), (0, pi/2)),
+    ((0, pi), (pi/2, pi)),
+    ((0, pi), (pi/3, 2*pi/3)),
+    ((0, pi, True, True), (0, pi/2, False, True)),
+    ((0, pi, True, True), (pi/2, pi, True, False)),
+    ((0, pi), (pi/2, pi/2)),
+    ((pi/2, 3*pi/2), (3*pi/2, pi/2)),
+    ((3*pi/2, pi/2), (0, pi/4)),
+    ((3*pi/2, pi/2), (pi, 0)),
+]
+
+
+# Результат + / - как множество точек: слитые дуги в делениях BAM
+def _result_ticks(result) -> list[Arc]:
+    arcs = []
+    for rng in result if isinstance(result, list) else [result]:
+        if isinstance(rng, BamAngleRange):
+            arcs += rng.arcs()
+        else:
+            arcs += [(_to_ticks(s), s_inc, _to_ticks(e), e_inc) for s, s_inc, e, e_inc in _range_arcs(rng)]
+    arcs.sort(key=_arc_key)
+    return _merge_arcs(arcs)
+
+
+# Сравнение с точной алгеброй AngleRange (union_all / difference_all) на сценариях test_add / test_sub
+def check_range_classes(range_cls=BamAngleRange) -> int:
+    for a, b in ADD_CASES:
+        expected = AngleRange.union_all([AngleRange(*a), AngleRange(*b)])
+        actual = range_cls(*a) + range_cls(*b)
+        assert _result_ticks(actual) == _result_ticks(expected), f"{a} + {b}: {actual} != {expected}"
+    for a, b in SUB_CASES:
+        expected = AngleRange.difference_all(AngleRange(*a), [AngleRange(*b)])
+        actual = range_cls(*a) - range_cls(*b)
+        assert _result_ticks(actual) == _result_ticks(expected), f"{a} - {b}: {actual} != {expected}"
+    return len(ADD_CASES) + len(SUB_CASES)
+
+
+def test_add(range_cls=AngleRange):
     def print_result(res):
         if isinstance(res, list):
             print([str(r) for r in res])
@@ -386,56 +1628,56 @@ def test_add():
             print(res)
 
     # --- 1. Простое объединение нециклических диапазонов ---
-    a1 = AngleRange(0, pi/2)
-    a2 = AngleRange(pi/3, pi)
+    a1 = range_cls(0, pi/2)
+    a2 = range_cls(pi/3, pi)
     res = a1 + a2
     print("Test 1:", end=" ")
     print_result(res)  # ожидание: [0, pi]
 
     # --- 2. Объединение двух смежных диапазонов ---
-    b1 = AngleRange(0, pi)
-    b2 = AngleRange(pi, 3*pi/2)
+    b1 = range_cls(0, pi)
+    b2 = range_cls(pi, 3*pi/2)
     res = b1 + b2
     print("Test 2:", end=" ")
     print_result(res)  # ожидание: [0, 3*pi/2]
 
     # --- 3. Объединение с циклическим диапазоном ---
-    c1 = AngleRange(5*pi/3, pi/3)  # циклический: [300°, 60°]
-    c2 = AngleRange(0, pi/2)       # [0°, 90°]
+    c1 = range_cls(5*pi/3, pi/3)  # циклический: [300°, 60°]
+    c2 = range_cls(0, pi/2)       # [0°, 90°]
     res = c1 + c2
     print("Test 3:", end=" ")
     print_result(res)  # ожидание: [5*pi/3, pi/2] → полный циклический диапазон
 
     # --- 4. Разорванные диапазоны не объединяются в один ---
-    d1 = AngleRange(pi, 3*pi/2)
-    d2 = AngleRange(0, pi/4)
+    d1 = range_cls(pi, 3*pi/2)
+    d2 = range_cls(0, pi/4)
     res = d1 + d2
     print("Test 4:", end=" ")
     print_result(res)  # ожидание: список из двух AngleRange
 
     # --- 5. Полный круг ---
-    e1 = AngleRange(0, 2*pi)
-    e2 = AngleRange(pi/2, pi)
+    e1 = range_cls(0, 2*pi)
+    e2 = range_cls(pi/2, pi)
     res = e1 + e2
     print("Test 5:", end=" ")
     print_result(res)  # ожидание: [0, 2*pi]
 
-def test_sub():
+def test_sub(range_cls=AngleRange):
     print("\n=== TEST 1: No overlap ===")
-    a = AngleRange(0, pi)
-    b = AngleRange(pi, 2*pi)
+    a = range_cls(0, pi)
+    b = range_cls(pi, 2*pi)
     print("a - b =", a - b)
 
 
     print("\n=== TEST 2: Full cover ===")
-    a = AngleRange(0, pi, True, True)
-    b = AngleRange(0, pi, True, True)
+    a = range_cls(0, pi, True, True)
+    b = range_cls(0, pi, True, True)
     print("a - b =", a - b)   # ожидаем []
 
 
     print("\n=== TEST 3: Full cover but endpoints remain ===")
-    a = AngleRange(0, pi, True, True)      # [0, π]
-    b = AngleRange(0, pi, False, False)    # (0, π)
+    a = range_cls(0, pi, True, True)      # [0, π]
+    b = range_cls(0, pi, False, False)    # (0, π)
     res = a - b
     print("a - b =", res)                   # ожидаем 0 и π в виде точек
     if isinstance(res, list):
@@ -444,20 +1686,20 @@ def test_sub():
 
 
     print("\n=== TEST 4: Partial left overlap ===")
-    a = AngleRange(0, pi)
-    b = AngleRange(0, pi/2)
+    a = range_cls(0, pi)
+    b = range_cls(0, pi/2)
     print("a - b =", a - b)
 
 
     print("\n=== TEST 5: Partial right overlap ===")
-    a = AngleRange(0, pi)
-    b = AngleRange(pi/2, pi)
+    a = range_cls(0, pi)
+    b = range_cls(pi/2, pi)
     print("a - b =", a - b)
 
 
     print("\n=== TEST 6: Middle cut (split in two) ===")
-    a = AngleRange(0, pi)
-    b = AngleRange(pi/3, 2*pi/3)
+    a = range_cls(0, pi)
+    b = range_cls(pi/3, 2*pi/3)
     res = a - b
     print("a - b =", res)
     if isinstance(res, list):
@@ -466,24 +1708,24 @@ def test_sub():
 
 
     print("\n=== TEST 7: Same left boundary, different inclusion ===")
-    a = AngleRange(0, pi, True, True)
-    b = AngleRange(0, pi/2, False, True)  # (0, π/2]
+    a = range_cls(0, pi, True, True)
+    b = range_cls(0, pi/2, False, True)  # (0, π/2]
     print("a - b =", a - b)
     if isinstance(res, list):
         for r in res:
             print("  part:", r)
 
     print("\n=== TEST 8: Same right boundary, different inclusion ===")
-    a = AngleRange(0, pi, True, True)
-    b = AngleRange(pi/2, pi, True, False)  # [π/2, π)
+    a = range_cls(0, pi, True, True)
+    b = range_cls(pi/2, pi, True, False)  # [π/2, π)
     print("a - b =", a - b)
     if isinstance(res, list):
         for r in res:
             print("  part:", r)
 
     print("\n=== TEST 9: Subtract point ===")
-    a = AngleRange(0, pi)
-    b = AngleRange(pi/2, pi/2)     # точка
+    a = range_cls(0, pi)
+    b = range_cls(pi/2, pi/2)     # точка
     res = a - b
     print("a - b =", res)
     if isinstance(res, list):
@@ -492,14 +1734,14 @@ def test_sub():
 
 
     print("\n=== TEST 10: Other cyclic, fully covering ===")
-    a = AngleRange(pi/2, 3*pi/2)
-    b = AngleRange(3*pi/2, pi/2) 
+    a = range_cls(pi/2, 3*pi/2)
+    b = range_cls(3*pi/2, pi/2) 
     print("a - b =", a - b)
 
 
     print("\n=== TEST 11: Self cyclic, partial subtraction ===")
-    a = AngleRange(3*pi/2, pi/2)   # циклический
-    b = AngleRange(0, pi/4)
+    a = range_cls(3*pi/2, pi/2)   # циклический
+    b = range_cls(0, pi/4)
     res = a - b
     print("a - b =", res)
     if isinstance(res, list):
@@ -508,48 +1750,54 @@ def test_sub():
 
 
     print("\n=== TEST 12: Both cyclic ===")
-    a = AngleRange(3*pi/2, pi/2)   # циклический
-    b = AngleRange(pi, 0)          # циклический
+    a = range_cls(3*pi/2, pi/2)   # циклический
+    b = range_cls(pi, 0)          # циклический
     res = a - b
     print("a - b =", res)
     if isinstance(res, list):
         for r in res:
             print("  part:", r)
 
-# Запуск тестов
-test_add()
-test_sub()
-print("=" * 10)
-a1 = AngleRange(pi/4, pi/2)
-a2 = AngleRange(3*pi/2, pi/2)
-a3 = AngleRange(pi/6, 5*pi/6)
-b = AngleRange(0, pi)
-print(a1 in b)
-print(a2 in b)
-print(a3 in b)
-e1 = AngleRange(pi/2, pi)
-e2 = AngleRange(5*pi/2, 3*pi)
-print(e1 == e2)
-print("=" * 10)
-c1 = Angle.from_degree(180)
-c1 = AngleRange.from_angle(c1)
-c2 = Angle.from_degree(270)
-c2 = AngleRange.from_angle(c2)
-q = AngleRange(3*pi/2, 5*pi/4)
-print(c1 in q)
-print(c2 in q)
-print("="*10)
-
-ang1 = Angle(pi/2)
-ang2 = Angle(pi/2)
-ang3 = Angle(pi)
-print(ang1 + ang2)
-print(ang1 + pi)
-print(ang1 * 2)
-print(ang3 - ang2)
-print(ang3 > ang1)
-print(ang1 == ang2)
-print("="*10)
-print(float(ang1))
-print(int(ang1))
-print(str(ang1))
+
+if __name__ == "__main__":
+    # Запуск тестов
+    test_add()
+    test_sub()
+    print("=" * 10)
+    test_add(BamAngleRange)
+    test_sub(BamAngleRange)
+    print(f"BamAngleRange matches AngleRange: {check_range_classes()} scenarios")
+    print("=" * 10)
+    a1 = AngleRange(pi/4, pi/2)
+    a2 = AngleRange(3*pi/2, pi/2)
+    a3 = AngleRange(pi/6, 5*pi/6)
+    b = AngleRange(0, pi)
+    print(a1 in b)
+    print(a2 in b)
+    print(a3 in b)
+    e1 = AngleRange(pi/2, pi)
+    e2 = AngleRange(5*pi/2, 3*pi)
+    print(e1 == e2)
+    print("=" * 10)
+    c1 = Angle.from_degree(180)
+    c1 = AngleRange.from_angle(c1)
+    c2 = Angle.from_degree(270)
+    c2 = AngleRange.from_angle(c2)
+    q = AngleRange(3*pi/2, 5*pi/4)
+    print(c1 in q)
+    print(c2 in q)
+    print("="*10)
+
+    ang1 = Angle(pi/2)
+    ang2 = Angle(pi/2)
+    ang3 = Angle(pi)
+    print(ang1 + ang2)
+    print(ang1 + pi)
+    print(ang1 * 2)
+    print(ang3 - ang2)
+    print(ang3 > ang1)
+    print(ang1 == ang2)
+    print("="*10)
+    print(float(ang1))
+    print(int(ang1))
+    print(str(ang1))
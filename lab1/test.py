@@ -0,0 +1,173 @@
+import random
+import unittest
+from math import pi
+
+import numpy as np
+
+from main import AngleArray, AngleRange, AngleRangeIndex, AngleRangeSet, ShardedRangeEngine
+
+
+# Концы промежутков и проверочные точки лежат на сетке UNIT = pi/32, поэтому
+# эталонная принадлежность считается в целых делениях, без погрешностей float
+UNIT = pi / 32
+TURN = 64
+
+
+def grid_range(start: int, end: int, include_start: bool = True, include_end: bool = True) -> AngleRange:
+    return AngleRange(start * UNIT, end * UNIT, include_start, include_end)
+
+
+def reference_contains(bounds: tuple[int, int, bool, bool], point: int) -> bool:
+    start, end, include_start, include_end = bounds
+    length = (end - start) % TURN
+    offset = (point - start) % TURN
+    if length == 0 and start != end:
+        return offset != 0 or include_start or include_end
+    if length == 0:
+        return offset == 0 and include_start and include_end
+    return 0 < offset < length or (offset == 0 and include_start) or (offset == length and include_end)
+
+
+def random_bounds(rnd: random.Random) -> tuple[int, int, bool, bool]:
+    kind = rnd.random()
+    if kind < 0.1:
+        start = end = rnd.randrange(0, TURN, 2)
+    elif kind < 0.2:
+        start, end = 0, TURN
+    else:
+        start, end = rnd.randrange(0, TURN + 1, 2), rnd.randrange(0, TURN + 1, 2)
+    return start, end, rnd.random() < 0.5, rnd.random() < 0.5
+
+
+class AngleArrayTest(unittest.TestCase):
+    def test_array_copy(self):
+        arr = AngleArray([0.0, pi/2, pi])
+        copied = np.array(arr, copy=True)
+        self.assertIsNot(copied, arr.angles)
+        copied[0] = 1.0
+        self.assertEqual(arr.angles[0], 0.0)
+
+    def test_array_no_copy(self):
+        arr = AngleArray([0.0, pi/2, pi])
+        self.assertIs(np.asarray(arr), arr.angles)
+        self.assertIs(np.array(arr, copy=False), arr.angles)
+
+    def test_array_dtype(self):
+        arr = AngleArray([0.0, pi/2, pi])
+        self.assertEqual(np.array(arr, dtype=np.float32).dtype, np.float32)
+        with self.assertRaises(ValueError):
+            np.array(arr, dtype=np.float32, copy=False)
+
+
+class AngleRangeSetTest(unittest.TestCase):
+    def assert_points(self, range_set: AngleRangeSet, expected) -> None:
+        for point in range(TURN):
+            self.assertEqual(point * UNIT in range_set, expected(point), f"point {point} in {range_set}")
+
+    def test_operations_pointwise(self):
+        rnd = random.Random(2)
+        for _ in range(300):
+            a = [random_bounds(rnd) for _ in range(rnd.randint(0, 4))]
+            b = [random_bounds(rnd) for _ in range(rnd.randint(0, 4))]
+            set_a = AngleRangeSet(grid_range(*bounds) for bounds in a)
+            set_b = AngleRangeSet(grid_range(*bounds) for bounds in b)
+            in_a = lambda p: any(reference_contains(bounds, p) for bounds in a)
+            in_b = lambda p: any(reference_contains(bounds, p) for bounds in b)
+
+            self.assert_points(set_a, in_a)
+            self.assert_points(set_a | set_b, lambda p: in_a(p) or in_b(p))
+            self.assert_points(set_a & set_b, lambda p: in_a(p) and in_b(p))
+            self.assert_points(set_a - set_b, lambda p: in_a(p) and not in_b(p))
+            self.assert_points(~set_a, lambda p: not in_a(p))
+            # Склейка через 0 / 2*pi обратно в промежутки не меняет множество
+            self.assertEqual(AngleRangeSet(set_a.to_ranges()), set_a)
+
+    def test_seam(self):
+        cyclic = AngleRangeSet([AngleRange(3*pi/2, pi/2)])
+        self.assertIn(0, cyclic)
+        self.assertIn(2*pi, cyclic)
+        self.assertNotIn(0, cyclic - AngleRange(0, pi/4))
+        self.assertIn(0, cyclic - AngleRange(0, pi/4, False, True))
+        self.assertEqual(cyclic & AngleRange(pi/4, 7*pi/4), AngleRangeSet([AngleRange(pi/4, pi/2), AngleRange(3*pi/2, 7*pi/4)]))
+
+    def test_circle_minus_point(self):
+        ranges = (AngleRangeSet([AngleRange(0, 2*pi)]) - AngleRange(pi, pi)).to_ranges()
+        self.assertEqual(len(ranges), 2)
+        self.assertNotIn(pi, AngleRangeSet(ranges))
+        self.assertIn(pi - 1e-9, AngleRangeSet(ranges))
+
+    def test_full_turn(self):
+        full = AngleRangeSet([AngleRange(1, 1 + 2*pi, False, False)])
+        self.assertNotIn(1, full)
+        self.assertIn(0, full)
+        self.assertIn(1, AngleRangeSet([AngleRange(1, 1 + 2*pi, True, False)]))
+
+
+class AngleRangeIndexTest(unittest.TestCase):
+    def test_against_linear_scan(self):
+        rnd = random.Random(4)
+        index = AngleRangeIndex()
+        live: dict[int, tuple[int, int, bool, bool]] = {}
+        for step in range(3000):
+            if live and rnd.random() < 0.4:
+                handle = rnd.choice(list(live))
+                rng = index[handle]
+                del live[handle]
+                self.assertIs(index.remove(handle), rng)
+            else:
+                bounds = random_bounds(rnd)
+                live[index.insert(grid_range(*bounds))] = bounds
+            self.assertEqual(len(index), len(live))
+
+            if step % 10 == 0:
+                point = rnd.randrange(TURN)
+                expected = sorted(h for h, bounds in live.items() if reference_contains(bounds, point))
+                self.assertEqual(index.stab_handles(point * UNIT), expected)
+
+                query = random_bounds(rnd)
+                query_set = AngleRangeSet([grid_range(*query)])
+                expected = [index[h] for h in sorted(live) if AngleRangeSet([index[h]]) & query_set]
+                self.assertEqual(index.overlapping(grid_range(*query)), expected)
+
+    def test_stab_many(self):
+        index = AngleRangeIndex([AngleRange(3*pi/2, pi/2), AngleRange(0, pi, False, True)])
+        self.assertEqual([len(found) for found in index.stab_many([0, pi/4, pi, -pi/2])], [1, 2, 1, 1])
+
+
+class ShardedRangeEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # 8 секторов по pi/4: границы сетки совпадают с границами секторов
+        cls.engine = ShardedRangeEngine(shards=8, workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.close()
+
+    def random_ranges(self, rnd: random.Random) -> list[AngleRange]:
+        ranges = []
+        for _ in range(rnd.randint(0, 40)):
+            if rnd.random() < 0.7:
+                ranges.append(grid_range(*random_bounds(rnd)))
+            else:
+                # Произвольные углы, в том числе за пределами [0, 2pi)
+                start = rnd.uniform(-10, 10)
+                ranges.append(AngleRange(start, start + rnd.uniform(0, 1), rnd.random() < 0.5, rnd.random() < 0.5))
+        return ranges
+
+    def test_matches_single_set(self):
+        rnd = random.Random(9)
+        for _ in range(30):
+            base, ranges = self.random_ranges(rnd), self.random_ranges(rnd)
+            self.assertEqual(self.engine.union(base).arcs, AngleRangeSet(base).arcs)
+            self.assertEqual(self.engine.difference(base, ranges).arcs, (AngleRangeSet(base) - AngleRangeSet(ranges)).arcs)
+
+    def test_seam(self):
+        ranges = [AngleRange(7*pi/4, pi/4), AngleRange(0, 0), AngleRange(pi/4, pi/2, False, True)]
+        self.assertEqual(self.engine.union(ranges).arcs, AngleRangeSet(ranges).arcs)
+        base = [AngleRange(0, 2*pi)]
+        self.assertEqual(self.engine.difference(base, ranges).arcs, (AngleRangeSet(base) - AngleRangeSet(ranges)).arcs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Пакетная выгрузка баннеров в текстовые файлы
+#
+#   python lab2/export.py jobs.json --workers 8
+#
+# jobs.json - список заданий:
+#   [{"text": "Hello", "font": "font7", "symbol": "#", "color": "RED", "path": "out/hello.txt"}, ...]
+# "color" можно не указывать - тогда файл пишется без ANSI-кодов.
+
+import argparse
+import json
+import os
+import sys
+
+from main import BannerJob, Color, FontRegistry, export_banners, fonts
+
+
+def load_jobs(path: str) -> list[BannerJob]:
+    with open(path, "r", encoding="utf-8") as f:
+        items = json.load(f)
+    return [
+        BannerJob(
+            text=item["text"],
+            font=item["font"],
+            symbol=item.get("symbol", "*"),
+            color=Color[item["color"]] if item.get("color") else None,
+            path=item["path"],
+        )
+        for item in items
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch ASCII-art banner export")
+    parser.add_argument("jobs", help="JSON-файл со списком заданий")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fonts-dir", help="каталог со шрифтами (по умолчанию рядом с main.py)")
+    parser.add_argument("--compiled-dir", help="куда сохранить скомпилированные .fnt (по умолчанию временный каталог)")
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args.jobs)
+    for directory in {os.path.dirname(job.path) for job in jobs}:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    registry = FontRegistry(args.fonts_dir) if args.fonts_dir else fonts
+    report = export_banners(jobs, args.workers, registry, args.compiled_dir)
+    print(
+        f"{report.jobs} banners, {report.bytes_written} bytes in {report.seconds:.3f} s "
+        f"({report.jobs_per_second:.0f} banners/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
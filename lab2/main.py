@@ -1,18 +1,146 @@
+import asyncio
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import Enum
-from tkinter import NO
-from typing import Self
+from typing import BinaryIO, Iterable, Iterator, Self, TextIO
 import os
+import re
+import sys
 import json
+import mmap
+import struct
+import tempfile
 import types
+import numpy as np
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
-path5 = os.path.join(script_dir, "font5.json")
-path7 = os.path.join(script_dir, "font7.json")
 
-with open(path5, "r") as f:
-    font5: dict = json.load(f)
-with open(path7, "r") as f:
-    font7: dict = json.load(f)
+
+# Компилированный формат шрифта (.fnt):
+#   заголовок  <4sHH   магическое число, высота, число глифов
+#   индекс     <IHI    код символа, ширина, смещение битмапа (на каждый глиф)
+#   битмапы    по height строк на глиф, ceil(width / 8) байт на строку, старший бит - левый пиксель
+FONT_MAGIC = b"FNT1"
+_FONT_HEADER = struct.Struct("<4sHH")
+_FONT_ENTRY = struct.Struct("<IHI")
+
+
+def compile_font(json_path: str, out_path: str | None = None) -> str:
+    with open(json_path, "r") as f:
+        font: dict = json.load(f)
+    out_path = out_path or os.path.splitext(json_path)[0] + ".fnt"
+
+    height = len(next(iter(font.values())))
+    index_size = _FONT_HEADER.size + _FONT_ENTRY.size * len(font)
+    entries, bitmaps = [], bytearray()
+    for char in sorted(font, key=ord):
+        lines = font[char]
+        width = len(lines[0])
+        entries.append(_FONT_ENTRY.pack(ord(char), width, index_size + len(bitmaps)))
+        for line in lines:
+            bits = int("".join("1" if c == "*" else "0" for c in line.ljust(-(-width // 8) * 8)), 2)
+            bitmaps += bits.to_bytes(-(-width // 8), "big")
+
+    with open(out_path, "wb") as f:
+        f.write(_FONT_HEADER.pack(FONT_MAGIC, height, len(font)))
+        f.write(b"".join(entries))
+        f.write(bitmaps)
+    return out_path
+
+
+# Шрифт из .fnt: файл отображается через mmap, глифы декодируются по первому обращению
+class CompiledFont(Mapping):
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.height, count = _FONT_HEADER.unpack_from(self._data, 0)
+        if magic != FONT_MAGIC:
+            raise ValueError(f"{path} is not a compiled font")
+
+        self._index: dict[str, tuple[int, int]] = {}
+        for i in range(count):
+            code, width, offset = _FONT_ENTRY.unpack_from(self._data, _FONT_HEADER.size + i * _FONT_ENTRY.size)
+            self._index[chr(code)] = (width, offset)
+        self._glyphs: dict[str, list[str]] = {}
+
+    def __getitem__(self, char: str) -> list[str]:
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            width, offset = self._index[char]
+            row_bytes = -(-width // 8)
+            glyph = []
+            for row in range(self.height):
+                start = offset + row * row_bytes
+                bits = int.from_bytes(self._data[start:start + row_bytes], "big")
+                line = format(bits, f"0{row_bytes * 8}b")[:width]
+                glyph.append(line.replace("1", "*").replace("0", " "))
+            self._glyphs[char] = glyph
+        return glyph
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def close(self) -> None:
+        self._data.close()
+
+
+# Реестр шрифтов: файлы только находятся по имени, загрузка - при первом обращении
+class FontRegistry():
+    def __init__(self, directory: str | None = None):
+        self._paths: dict[str, str] = {}
+        self._fonts: dict[str, Mapping] = {}
+        if directory is not None:
+            self.discover(directory)
+
+    def discover(self, directory: str) -> None:
+        for file_name in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(file_name)
+            # Компилированный шрифт предпочтительнее JSON с тем же именем
+            if ext == ".fnt" or (ext == ".json" and not self._paths.get(name, "").endswith(".fnt")):
+                self._paths[name] = os.path.join(directory, file_name)
+
+    def register(self, name: str, path: str) -> None:
+        self._paths[name] = path
+        self._fonts.pop(name, None)
+
+    def path(self, name: str) -> str:
+        return self._paths[name]
+
+    def get(self, name: str) -> Mapping:
+        font = self._fonts.get(name)
+        if font is None:
+            path = self._paths[name]
+            if path.endswith(".fnt"):
+                font = CompiledFont(path)
+            else:
+                with open(path, "r") as f:
+                    font = json.load(f)
+            self._fonts[name] = font
+        return font
+
+    __getitem__ = get
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._paths
+
+    def names(self) -> list[str]:
+        return list(self._paths)
+
+
+fonts = FontRegistry(script_dir)
+
+
+# font5, font7 и т.д. как атрибуты модуля загружаются лениво
+def __getattr__(name: str) -> Mapping:
+    if name in fonts:
+        return fonts[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Color(Enum):
@@ -26,32 +154,196 @@ class Color(Enum):
     WHITE = "\033[37m"
 
 
+# Шрифт, скомпилированный под конкретный символ: строки глифов уже с подставленным
+# символом и межбуквенным интервалом, поэтому строка баннера собирается одним join
+class GlyphSet():
+    # LRU: кэш не должен держать в памяти все когда-либо использованные шрифты
+    _cache: OrderedDict[tuple[int, str], tuple[dict, "GlyphSet"]] = OrderedDict()
+    _maxsize = 32
+
+    def __init__(self, font: dict, symbol: str):
+        self.height = len(next(iter(font.values())))
+        self.glyphs = {
+            char: tuple(line.replace("*", symbol) + (" " * 2) for line in lines)
+            for char, lines in font.items()
+        }
+        self.widths = {char: len(lines[0]) for char, lines in self.glyphs.items()}
+
+    @classmethod
+    def get(cls, font: dict, symbol: str) -> Self:
+        key = (id(font), symbol)
+        cached = cls._cache.get(key)
+        # Шрифт хранится рядом, чтобы id не переиспользовался другим объектом
+        if cached is None or cached[0] is not font:
+            cached = (font, cls(font, symbol))
+            cls._cache[key] = cached
+            while len(cls._cache) > cls._maxsize:
+                cls._cache.popitem(last=False)
+        else:
+            cls._cache.move_to_end(key)
+        return cached[1]
+
+    def render(self, text: str, offset: str = "") -> list[str]:
+        chars = [self.glyphs[smbl] for smbl in text.upper()]
+        if not chars:
+            return [offset] * self.height
+        return [offset + "".join(row) for row in zip(*chars)]
+
+
+# LRU-кэш готовых кадров: повторный баннер - один поиск в словаре и одна запись.
+# Кадр хранится вместе со шрифтом, как в GlyphSet.get: id шрифта в ключе мог достаться
+# другому объекту, такой кадр считается промахом
+class RenderCache():
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._frames: OrderedDict[tuple, tuple[Mapping, str | bytes]] = OrderedDict()
+
+    def get(self, key: tuple, font: Mapping) -> str | bytes | None:
+        cached = self._frames.get(key)
+        if cached is None or cached[0] is not font:
+            self.misses += 1
+            return None
+        self._frames.move_to_end(key)
+        self.hits += 1
+        return cached[1]
+
+    def put(self, key: tuple, font: Mapping, frame: str | bytes) -> None:
+        self._frames[key] = (font, frame)
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.maxsize:
+            self._frames.popitem(last=False)
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+render_cache = RenderCache()
+
+
 class Printer():
-    def __init__(self, font: dict, color: Color, position: tuple[int, int], symbol: str):
+    def __init__(self, font: dict, color: Color, position: tuple[int, int], symbol: str, cache: RenderCache | None = None, stream: BinaryIO | None = None):
         self.font = font
         self.color = color
         self.position = position
         self.symbol = symbol
+        self.cache = cache if cache is not None else render_cache
+        self.stream = stream
     
     @classmethod
     def print_text(cls, text: str, font: dict, color: Color, position: tuple[int, int], symbol: str):
-        P = cls(color, position, symbol)
+        P = cls(font, color, position, symbol)
         P.print(text)
 
-    def print(self, text: str):
-        x, y = self.position
+    def render(self, text: str) -> list[str]:
+        offset = " " * self.position[1]
+        rows = GlyphSet.get(self.font, self.symbol).render(text, offset)
+        return rows + [offset] * 2
 
-        print("\n" * x, end="")
+    def render_frame(self, text: str) -> str:
+        key = (text, id(self.font), self.symbol, self.color, self.position)
+        frame = self.cache.get(key, self.font)
+        if frame is None:
+            x, y = self.position
+            frame = "\n" * x + "".join(f"{self.color.value}{row}\n" for row in self.render(text))
+            self.cache.put(key, self.font, frame)
+        return frame
 
-        num_of_lines = len(list(self.font.values())[0])
+    # Кадр целиком в байтах: цвет выставляется один раз на весь кадр
+    def render_bytes(self, text: str) -> bytes:
+        key = (text, id(self.font), self.symbol, self.color, self.position, bytes)
+        frame = self.cache.get(key, self.font)
+        if frame is None:
+            x, y = self.position
+            rows = "\n".join(self.render(text))
+            frame = ("\n" * x + self.color.value + rows + "\n").encode("utf-8")
+            self.cache.put(key, self.font, frame)
+        return frame
 
-        rows = ['' + (' ' * y)] * (num_of_lines + 2)
-        for smbl in text.upper():
-            for i, line in enumerate(self.font[smbl]):
-                rows[i] += line + (" " * 2)
-        
-        for row in rows:
-            print(self.color.value + row.replace("*", self.symbol))
+    # Один вызов write на кадр в бинарный поток (файл, pipe, BytesIO)
+    def write(self, text: str, stream: BinaryIO | None = None) -> int:
+        stream = stream or self.stream
+        if stream is None:
+            sys.stdout.flush()
+            stream = sys.stdout.buffer
+        return stream.write(self.render_bytes(text))
+
+    # Потоковый рендер с переносом по словам: блок строк баннера отдается,
+    # как только заполнена очередная строка текста шириной width символов терминала
+    def render_stream(self, chunks: Iterable[str], width: int) -> Iterator[list[str]]:
+        for line in self._wrap_lines(self._tokens(chunks), width):
+            yield self.render(line)
+
+    def print_stream(self, chunks: Iterable[str], width: int) -> None:
+        for rows in self.render_stream(chunks, width):
+            sys.stdout.write("".join(f"{self.color.value}{row}\n" for row in rows))
+
+    # Куски слов отдаются сразу, без склейки: слово, разрезанное между чанками,
+    # собирается в _wrap_lines, поэтому каждый чанк разбирается ровно один раз
+    @staticmethod
+    def _tokens(chunks: Iterable[str]) -> Iterator[str]:
+        for chunk in chunks:
+            yield from (part for part in re.split(r"([ \n])", chunk.upper()) if part)
+
+    def _wrap_lines(self, tokens: Iterable[str], width: int) -> Iterator[str]:
+        widths = GlyphSet.get(self.font, self.symbol).widths
+        available = width - self.position[1]
+        space = widths[" "]
+
+        line, line_width = "", 0
+        word, word_width = "", 0
+        for token in tokens:
+            if token != " " and token != "\n":
+                word += token
+                word_width += sum(widths[char] for char in token)
+                if word_width <= available:
+                    continue
+                # Слово шире строки режется по символам, не дожидаясь его конца:
+                # в памяти остается не больше строки
+                if line:
+                    yield line
+                    line, line_width = "", 0
+                while word_width > available and len(word) > 1:
+                    cut, cut_width = 1, widths[word[0]]
+                    while cut < len(word) and cut_width + widths[word[cut]] <= available:
+                        cut_width += widths[word[cut]]
+                        cut += 1
+                    yield word[:cut]
+                    word, word_width = word[cut:], word_width - cut_width
+                continue
+
+            line, line_width = yield from self._place_word(line, line_width, word, word_width, space, available)
+            word, word_width = "", 0
+            if token == "\n":
+                yield line
+                line, line_width = "", 0
+
+        line, line_width = yield from self._place_word(line, line_width, word, word_width, space, available)
+        if line:
+            yield line
+
+    @staticmethod
+    def _place_word(line: str, line_width: int, word: str, word_width: int, space: int, available: int):
+        if not word:
+            return line, line_width
+        gap = space if line else 0
+        if line_width + gap + word_width <= available:
+            return (f"{line} {word}" if line else word), line_width + gap + word_width
+        if line:
+            yield line
+        return word, word_width
+
+    def print(self, text: str):
+        if self.stream is not None:
+            self.write(text)
+        else:
+            sys.stdout.write(self.render_frame(text))
     
     def __enter__(self):
         return self
@@ -62,16 +354,269 @@ class Printer():
             exc_value: BaseException | None,
             traceback: types.TracebackType | None
     ) -> None:
-        print(Color.RESET.value, end="")
+        if self.stream is not None:
+            self.stream.write(Color.RESET.value.encode("utf-8"))
+        else:
+            print(Color.RESET.value, end="")
         
 
 
-# Printer.print_text("Hello, world!", Color.RED, (5, 10), "5")
+# Холст из нескольких баннеров: символы и цвета хранятся в uint8-плоскостях,
+# при перерисовке в терминал уходят только изменившиеся ячейки.
+# В плоскости символов лежат индексы в палитре холста, поэтому символ печати
+# может быть любым (например "█"), лишь бы разных символов было не больше 256
+class Canvas():
+    COLORS = list(Color)
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.palette = [" "]
+        self._palette_index = {" ": 0}
+        self.chars = np.zeros((height, width), dtype=np.uint8)
+        self.colors = np.zeros((height, width), dtype=np.uint8)
+        self._prev_chars: np.ndarray | None = None
+        self._prev_colors: np.ndarray | None = None
+
+    def clear(self) -> None:
+        self.chars.fill(0)
+        self.colors.fill(0)
+
+    # Следующий кадр будет выведен целиком
+    def invalidate(self) -> None:
+        self._prev_chars = None
+        self._prev_colors = None
+
+    def _symbol_index(self, symbol: str) -> int:
+        index = self._palette_index.get(symbol)
+        if index is None:
+            if len(symbol) != 1:
+                raise ValueError(f"Canvas symbol must be a single character, got {symbol!r}")
+            if len(self.palette) > 255:
+                raise ValueError("Canvas palette is full: at most 256 different symbols")
+            index = len(self.palette)
+            self.palette.append(symbol)
+            self._palette_index[symbol] = index
+        return index
+
+    def draw(self, printer: Printer, text: str, row: int | None = None, col: int | None = None) -> None:
+        row = printer.position[0] if row is None else row
+        col = printer.position[1] if col is None else col
+        symbol = self._symbol_index(printer.symbol)
+
+        # Глифы берутся в исходном виде ("*"), символ печати подставляется индексом палитры
+        rows = GlyphSet.get(printer.font, "*").render(text)
+        block = np.frombuffer("".join(rows).encode("ascii"), dtype=np.uint8).reshape(len(rows), -1)
+
+        top, left = max(row, 0), max(col, 0)
+        bottom, right = min(row + block.shape[0], self.height), min(col + block.shape[1], self.width)
+        if top >= bottom or left >= right:
+            return
+        block = block[top - row:bottom - row, left - col:right - col]
+
+        # Пробелы глифов прозрачны, поэтому тексты можно накладывать друг на друга
+        mask = block == ord("*")
+        self.chars[top:bottom, left:right][mask] = symbol
+        self.colors[top:bottom, left:right][mask] = self.COLORS.index(printer.color)
+
+    def render_diff(self) -> str:
+        if self._prev_chars is None:
+            changed = np.ones(self.chars.shape, dtype=bool)
+        else:
+            changed = (self.chars != self._prev_chars) | (self.colors != self._prev_colors)
+
+        out = []
+        current_color = None
+        for r in np.flatnonzero(changed.any(axis=1)).tolist():
+            cols = np.flatnonzero(changed[r])
+            # Подряд идущие изменившиеся ячейки выводятся одним куском после одного перемещения курсора
+            for run in np.split(cols, np.flatnonzero(np.diff(cols) != 1) + 1):
+                start, end = int(run[0]), int(run[-1]) + 1
+                out.append(f"\033[{r + 1};{start + 1}H")
+                colors = self.colors[r, start:end]
+                bounds = [0] + (np.flatnonzero(np.diff(colors)) + 1).tolist() + [end - start]
+                for a, b in zip(bounds, bounds[1:]):
+                    color = int(colors[a])
+                    if color != current_color:
+                        out.append(self.COLORS[color].value)
+                        current_color = color
+                    out.append("".join(self.palette[i] for i in self.chars[r, start + a:start + b].tolist()))
+        if out:
+            out.append(Color.RESET.value)
+
+        self._prev_chars = self.chars.copy()
+        self._prev_colors = self.colors.copy()
+        return "".join(out)
+
+    def flush(self, stream: TextIO | None = None) -> int:
+        stream = stream or sys.stdout
+        written = stream.write(self.render_diff())
+        stream.flush()
+        return written
+
+
+@dataclass
+class FrameStats():
+    rendered: int = 0
+    skipped: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.rendered if self.rendered else 0.0
+
+
+# Бегущая строка: глифы текста один раз складываются в полосу,
+# каждый кадр - срез полосы; при отставании от целевого FPS кадры пропускаются
+class Marquee():
+    def __init__(self, printer: Printer, text: str, width: int, fps: float = 30.0, stream: TextIO | None = None):
+        self.printer = printer
+        self.width = width
+        self.fps = fps
+        self.stream = stream or sys.stdout
+        self.stats = FrameStats()
+        self._running = False
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        rows = GlyphSet.get(self.printer.font, self.printer.symbol).render(text)
+        # Пробел шириной окна между повторами, полоса повторена так, чтобы любой срез был целым
+        self._period = len(rows[0]) + self.width
+        repeats = 1 + -(-self.width // self._period)
+        self._strip = [(row + " " * self.width) * repeats for row in rows]
+
+    def frame(self, offset: int) -> str:
+        offset %= self._period
+        indent = " " * self.printer.position[1]
+        rows = [indent + row[offset:offset + self.width] for row in self._strip]
+        return self.printer.color.value + "\n".join(rows) + "\n"
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def run(self, frames: int | None = None, step: int = 1) -> FrameStats:
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.fps
+        start = loop.time()
+        index = 0
+        self._running = True
+
+        self.stream.write("\n" * self.printer.position[0])
+        while self._running and (frames is None or self.stats.rendered < frames):
+            begin = time.perf_counter()
+            if self.stats.rendered:
+                # Курсор возвращается к первой строке предыдущего кадра
+                self.stream.write(f"\033[{len(self._strip)}A")
+            self.stream.write(self.frame(index * step))
+            self.stream.flush()
+
+            elapsed = time.perf_counter() - begin
+            self.stats.rendered += 1
+            self.stats.total_time += elapsed
+            self.stats.max_time = max(self.stats.max_time, elapsed)
+
+            index += 1
+            deadline = start + index * interval
+            now = loop.time()
+            if now > deadline:
+                behind = int((now - deadline) / interval) + 1
+                index += behind
+                self.stats.skipped += behind
+                deadline = start + index * interval
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+        self.stream.write(Color.RESET.value)
+        self._running = False
+        return self.stats
+
+
+# Пакетная выгрузка баннеров в файлы пулом процессов ==============================
+@dataclass
+class BannerJob():
+    text: str
+    font: str                   # имя шрифта в реестре
+    symbol: str
+    color: Color | None
+    path: str
+
+
+@dataclass
+class ExportReport():
+    jobs: int
+    bytes_written: int
+    seconds: float
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.jobs / self.seconds if self.seconds else 0.0
+
+
+_worker_fonts: FontRegistry | None = None
+
+
+# Рабочий процесс получает только пути к .fnt и отображает их через mmap, JSON не разбирается
+def _init_export_worker(paths: dict[str, str]) -> None:
+    global _worker_fonts
+    _worker_fonts = FontRegistry()
+    for name, path in paths.items():
+        _worker_fonts.register(name, path)
+
+
+def _export_chunk(jobs: list[BannerJob]) -> int:
+    written = 0
+    for job in jobs:
+        printer = Printer(_worker_fonts[job.font], job.color or Color.RESET, (0, 0), job.symbol, cache=RenderCache(0))
+        if job.color is None:
+            data = ("\n".join(printer.render(job.text)) + "\n").encode("utf-8")
+        else:
+            # Цвет сбрасывается в конце файла, чтобы cat не оставлял терминал окрашенным
+            data = printer.render_bytes(job.text) + Color.RESET.value.encode("utf-8")
+        with open(job.path, "wb") as f:
+            written += f.write(data)
+    return written
+
+
+def export_banners(jobs: list[BannerJob], workers: int | None = None, registry: FontRegistry | None = None, compiled_dir: str | None = None) -> ExportReport:
+    registry = registry or fonts
+    workers = workers or os.cpu_count() or 1
+
+    if compiled_dir is not None:
+        os.makedirs(compiled_dir, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Шрифты компилируются один раз в родительском процессе
+        paths = {}
+        for name in {job.font for job in jobs}:
+            path = registry.path(name)
+            if not path.endswith(".fnt"):
+                path = compile_font(path, os.path.join(compiled_dir or tmp_dir, f"{name}.fnt"))
+            paths[name] = path
+
+        chunk_size = max(1, -(-len(jobs) // (workers * 4)))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker, initargs=(paths,)) as executor:
+            written = sum(executor.map(_export_chunk, chunks))
+        seconds = time.perf_counter() - start
+
+    return ExportReport(len(jobs), written, seconds)
+
+
+if __name__ == "__main__":
+    # python main.py compile font5.json font7.json
+    if sys.argv[1:2] == ["compile"]:
+        for path in sys.argv[2:]:
+            print(compile_font(path))
+        sys.exit()
+
+    # Printer.print_text("Hello, world!", fonts["font5"], Color.RED, (5, 10), "5")
 
-with Printer(font7, Color.GREEN, (2, 3), "$") as printer:
-    printer.print("Hello,")
-    printer.print("World!")
+    with Printer(fonts["font7"], Color.GREEN, (2, 3), "$") as printer:
+        printer.print("Hello,")
+        printer.print("World!")
 
-with Printer(font5, Color.BLUE, (2, 3), "0") as printer:
-    printer.print("Hello,")
-    printer.print("World!")
\ No newline at end of file
+    with Printer(fonts["font5"], Color.BLUE, (2, 3), "0") as printer:
+        printer.print("Hello,")
+        printer.print("World!")
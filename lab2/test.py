@@ -0,0 +1,152 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from main import Canvas, Color, CompiledFont, FontRegistry, GlyphSet, Printer, RenderCache, compile_font, fonts, script_dir
+
+
+class CompiledFontTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def compile(self, name: str) -> tuple[dict, CompiledFont]:
+        json_path = os.path.join(script_dir, f"{name}.json")
+        with open(json_path, "r") as f:
+            font = json.load(f)
+        compiled = CompiledFont(compile_font(json_path, os.path.join(self.tmp.name, f"{name}.fnt")))
+        self.addCleanup(compiled.close)
+        return font, compiled
+
+    def test_round_trip(self):
+        for name in ("font5", "font7"):
+            with self.subTest(font=name):
+                font, compiled = self.compile(name)
+                self.assertEqual(compiled.height, len(font["A"]))
+                self.assertEqual(sorted(compiled), sorted(font))
+                self.assertEqual(dict(compiled), font)
+
+    def test_wide_glyph(self):
+        # Глиф шире 8 пикселей занимает несколько байт на строку
+        json_path = os.path.join(self.tmp.name, "wide.json")
+        font = {"A": ["*" * 9 + " " + "*", " " * 10 + "*"], " ": ["  ", "  "]}
+        with open(json_path, "w") as f:
+            json.dump(font, f)
+        compiled = CompiledFont(compile_font(json_path))
+        self.addCleanup(compiled.close)
+        self.assertEqual(dict(compiled), font)
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.tmp.name, "font5.fnt")
+        with open(path, "wb") as f:
+            f.write(b"JSON" + bytes(16))
+        with self.assertRaises(ValueError):
+            CompiledFont(path)
+
+    def test_renders_like_json(self):
+        font, compiled = self.compile("font7")
+        text = "HELLO, WORLD!"
+        self.assertEqual(
+            Printer(compiled, Color.RED, (1, 2), "#").render_frame(text),
+            Printer(font, Color.RED, (1, 2), "#").render_frame(text),
+        )
+
+    def test_registry_prefers_compiled(self):
+        _, compiled = self.compile("font5")
+        registry = FontRegistry(self.tmp.name)
+        with open(os.path.join(self.tmp.name, "font5.json"), "w") as f:
+            json.dump({}, f)
+        registry.discover(self.tmp.name)
+        self.assertTrue(registry.path("font5").endswith(".fnt"))
+        self.assertEqual(dict(registry["font5"]), dict(compiled))
+        registry["font5"].close()
+
+
+class WrapLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.printer = Printer(fonts["font5"], Color.GREEN, (0, 3), "#")
+        self.widths = GlyphSet.get(self.printer.font, self.printer.symbol).widths
+
+    def wrap(self, chunks: list[str], width: int) -> list[str]:
+        return list(self.printer._wrap_lines(self.printer._tokens(chunks), width))
+
+    def random_text(self, rnd: random.Random) -> str:
+        words = ["".join(rnd.choice("ABCXYZ!.") for _ in range(rnd.randint(1, 14))) for _ in range(rnd.randint(0, 20))]
+        return "".join(word + rnd.choice(["  ", " ", " ", " ", "\n"]) for word in words)
+
+    def test_chunking_does_not_matter(self):
+        rnd = random.Random(17)
+        for _ in range(200):
+            text, width = self.random_text(rnd), rnd.randint(20, 120)
+            expected = self.wrap([text], width)
+            cuts = sorted(rnd.sample(range(len(text) + 1), min(len(text) + 1, rnd.randint(0, 10))))
+            chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+            self.assertEqual(self.wrap(chunks, width), expected)
+            self.assertEqual(self.wrap(list(text), width), expected)
+
+    def test_rows_fit_width(self):
+        rnd = random.Random(5)
+        for _ in range(200):
+            text, width = self.random_text(rnd), rnd.randint(20, 120)
+            lines = self.wrap([text], width)
+            # Текст не теряется: слова на выходе те же, что на входе (длинные - по кускам)
+            self.assertEqual("".join("".join(lines).split()), "".join(text.split()))
+            for rows in self.printer.render_stream([text], width):
+                for row in rows:
+                    self.assertLessEqual(len(row), width)
+
+    def test_wide_word_is_cut(self):
+        width = self.printer.position[1] + 4 * self.widths["A"]
+        self.assertEqual(self.wrap(["X AAAAAAAAAA Y"], width), ["X", "AAAA", "AAAA", "AA Y"])
+        # Разрез не зависит от того, где слово разбито между чанками
+        self.assertEqual(self.wrap(["X AAA", "AAAAAA", "A Y"], width), ["X", "AAAA", "AAAA", "AA Y"])
+
+    def test_newline_breaks_line(self):
+        self.assertEqual(self.wrap(["AB\nC", "D\n\nE"], 200), ["AB", "CD", "", "E"])
+        self.assertEqual(self.wrap(["AB \n", " C"], 200), ["AB", "C"])
+
+
+class CanvasTest(unittest.TestCase):
+    def test_any_symbol(self):
+        canvas = Canvas(40, 6)
+        canvas.draw(Printer(fonts["font5"], Color.RED, (0, 0), "█"), "HI")
+        canvas.draw(Printer(fonts["font5"], Color.BLUE, (1, 4), "#"), "I")
+        self.assertEqual(canvas.palette, [" ", "█", "#"])
+
+        out = canvas.render_diff()
+        self.assertIn("█", out)
+        self.assertIn("#", out)
+        # Без изменений перерисовывать нечего
+        self.assertEqual(canvas.render_diff(), "")
+
+        expected = Printer(fonts["font5"], Color.RED, (0, 0), "█").render("HI")[0]
+        self.assertEqual("".join(canvas.palette[i] for i in canvas.chars[0].tolist()).rstrip(), expected.rstrip())
+
+    def test_rejects_multichar_symbol(self):
+        with self.assertRaises(ValueError):
+            Canvas(10, 5).draw(Printer(fonts["font5"], Color.RED, (0, 0), "##"), "A")
+
+
+class RenderCacheTest(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = RenderCache()
+        printer = Printer(fonts["font5"], Color.CYAN, (0, 0), "#", cache=cache)
+        frame = printer.render_frame("AB")
+        self.assertIs(printer.render_frame("AB"), frame)
+        printer.render_bytes("AB")
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_other_font_with_same_key_is_a_miss(self):
+        cache = RenderCache()
+        font = dict(fonts["font5"])
+        cache.put(("AB", id(font)), font, "frame")
+        self.assertEqual(cache.get(("AB", id(font)), font), "frame")
+        # Тот же ключ, но кадр строился для другого объекта шрифта
+        self.assertIsNone(cache.get(("AB", id(font)), dict(font)))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,20 @@ import re
 import socket
 import os
 import tempfile
+import getpass
 from ftplib import FTP
 from datetime import datetime
 from warnings import filters
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Self
+import atexit
+import gzip
+import shutil
+import struct
+import time
+import threading
+import types
 
 
 class LogLevel(Enum):
@@ -31,9 +42,10 @@ class SimpleLogFilter(LogFilterProtocol):
 class ReLogFilter(LogFilterProtocol):
     def __init__(self, pattern: str):
         self.pattern = pattern
+        self._regex = re.compile(pattern)
     
     def match(self, log_level: LogLevel, text: str):
-        return re.match(self.pattern, text)
+        return self._regex.match(text) is not None
 
 class LevelFilter(LogFilterProtocol):
     def __init__(self, log_level: LogLevel):
@@ -43,12 +55,214 @@ class LevelFilter(LogFilterProtocol):
         return self.log_level == log_level
 
 
+# Фильтр по множеству ключевых слов (Ахо-Корасик): автомат строится один раз,
+# текст просматривается за один проход независимо от числа слов
+class KeywordLogFilter(LogFilterProtocol):
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False) -> None:
+        self.ignore_case = ignore_case
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+        self._build()
+
+    def _build(self) -> None:
+        for index, keyword in enumerate(self.keywords):
+            if self.ignore_case:
+                keyword = keyword.casefold()
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (index,)
+
+        # Обход в ширину: ссылка неудачи ведет в самый длинный собственный суффикс,
+        # выходы суффиксов сразу добавляются к выходам состояния
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def _scan(self, text: str):
+        goto, fail, output = self._goto, self._fail, self._output
+        if self.ignore_case:
+            text = text.casefold()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                yield output[state]
+
+    def match(self, log_level: LogLevel, text: str) -> bool:
+        for _ in self._scan(text):
+            return True
+        return False
+
+    # Все найденные слова - для маршрутизации записи
+    def matches(self, text: str) -> set[str]:
+        found = set()
+        for indices in self._scan(text):
+            found.update(indices)
+        return {self.keywords[index] for index in found}
+
+
+
+@dataclass
+class FilterStats():
+    log_filter: LogFilterProtocol
+    cost: float                 # оценка времени одной проверки, с
+    evaluations: int = 0
+    rejections: int = 0
+    timed_calls: int = 0
+    timed_seconds: float = 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return (self.rejections + 1) / (self.evaluations + 2)
+
+    # Ожидаемая цена отсева одной записи: дешевые и часто отсеивающие фильтры идут первыми
+    @property
+    def score(self) -> float:
+        return self.cost / self.rejection_rate
+
+
+# Начальные оценки цены, пока фильтр не замерен
+FILTER_COSTS: dict[type, float] = {
+    LevelFilter: 5e-8,
+    SimpleLogFilter: 1e-7,
+    ReLogFilter: 1e-6,
+    KeywordLogFilter: 2e-6,
+}
+DEFAULT_FILTER_COST = 5e-7
+
+
+# Цепочка фильтров с логикой "все должны пройти": порядок проверки подстраивается
+# под замеренную цену и долю отсеянных записей, результат от порядка не зависит
+class FilterChain(LogFilterProtocol):
+    def __init__(self, filters: list[LogFilterProtocol], sample_every: int = 64, reorder_every: int = 1024) -> None:
+        self._filters = list(filters)
+        self.sample_every = sample_every
+        self.reorder_every = reorder_every
+        self._stats = {id(f): self._make_stats(f) for f in self._filters}
+        self._calls = 0
+        self._reorder()
+        self._update_levels()
+
+    # Только для чтения: список меняется через add / remove, чтобы статистика и порядок не разошлись с ним
+    @property
+    def filters(self) -> tuple[LogFilterProtocol, ...]:
+        return tuple(self._filters)
+
+    @staticmethod
+    def _make_stats(log_filter: LogFilterProtocol) -> FilterStats:
+        return FilterStats(log_filter, FILTER_COSTS.get(type(log_filter), DEFAULT_FILTER_COST))
+
+    # LevelFilter проверяются отдельно через enabled_levels, в порядок проверки текста не входят
+    def _reorder(self) -> None:
+        content = [stats for stats in self._stats.values() if not isinstance(stats.log_filter, LevelFilter)]
+        self._order = sorted(content, key=lambda stats: stats.score)
+
+    # Уровни, которые пропускают все LevelFilter цепочки, и для остальных уровней -
+    # фильтр, которому засчитывается отказ
+    def _update_levels(self) -> None:
+        self._level_stats = [self._stats[id(f)] for f in self._filters if isinstance(f, LevelFilter)]
+        self._rejectors: dict[LogLevel, FilterStats] = {}
+        for log_level in LogLevel:
+            for stats in self._level_stats:
+                if stats.log_filter.log_level != log_level:
+                    self._rejectors[log_level] = stats
+                    break
+        self.enabled_levels = frozenset(set(LogLevel) - set(self._rejectors))
+
+    def match(self, log_level: LogLevel, text: str) -> bool:
+        return self.match_level(log_level) and self.match_content(log_level, text)
+
+    # Проверка уровня без текста: одна выборка из словаря вместо вызова LevelFilter
+    def match_level(self, log_level: LogLevel) -> bool:
+        rejector = self._rejectors.get(log_level)
+        if rejector is None:
+            for stats in self._level_stats:
+                stats.evaluations += 1
+            return True
+        rejector.evaluations += 1
+        rejector.rejections += 1
+        return False
+
+    def match_content(self, log_level: LogLevel, text: str) -> bool:
+        self._calls += 1
+        if self._calls % self.sample_every:
+            for stats in self._order:
+                stats.evaluations += 1
+                if not stats.log_filter.match(log_level, text):
+                    stats.rejections += 1
+                    return False
+            return True
+
+        # Каждую sample_every-ю запись проверки замеряются
+        result = True
+        for stats in self._order:
+            start = time.perf_counter()
+            passed = stats.log_filter.match(log_level, text)
+            stats.timed_seconds += time.perf_counter() - start
+            stats.timed_calls += 1
+            stats.cost = stats.timed_seconds / stats.timed_calls
+            stats.evaluations += 1
+            if not passed:
+                stats.rejections += 1
+                result = False
+                break
+        if self._calls % self.reorder_every < self.sample_every:
+            self._reorder()
+        return result
+
+    def add(self, log_filter: LogFilterProtocol) -> None:
+        self._filters.append(log_filter)
+        self._stats[id(log_filter)] = self._make_stats(log_filter)
+        self._reorder()
+        self._update_levels()
+
+    def remove(self, log_filter: LogFilterProtocol) -> None:
+        self._filters.remove(log_filter)
+        del self._stats[id(log_filter)]
+        self._reorder()
+        self._update_levels()
+
+    # Текущий порядок проверки вместе со счетчиками
+    def stats(self) -> list[FilterStats]:
+        return self._level_stats + self._order
+
+
 # HANDLERS ======================================================
 class LogHandlerProtocol(ABC):
     @abstractmethod
     def handle(self, log_level: LogLevel, text: str):
         pass
 
+    # Обработчики с буферизацией могут переопределить пакетную запись
+    def handle_batch(self, records: list[tuple[LogLevel, str]]) -> None:
+        for log_level, text in records:
+            self.handle(log_level, text)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
 class FileHandler(LogHandlerProtocol):
     def __init__(self, file_path: str):
         self.file_path = file_path
@@ -56,10 +270,168 @@ class FileHandler(LogHandlerProtocol):
     def handle(self, log_level: LogLevel, text: str):
         try:
             with open(self.file_path, 'a', encoding="utf-8") as file:
-                file.write(text)
+                file.write(text + "\n")
         except Exception as e:
             pass
 
+# Файл держится открытым, записи копятся в буфере и сбрасываются по объему, по времени
+# или сразу для важных уровней; ротация по размеру или по времени, сжатие старых частей в фоне
+class BufferedFileHandler(LogHandlerProtocol):
+    def __init__(
+            self,
+            file_path: str,
+            buffer_bytes: int = 64 * 1024,
+            flush_interval: float | None = 1.0,
+            flush_levels: Iterable[LogLevel] = (LogLevel.ERROR,),
+            max_bytes: int | None = None,
+            rotate_interval: float | None = None,
+            backup_count: int = 5,
+            compress: bool = False
+    ) -> None:
+        self.file_path = file_path
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+        self.flush_levels = set(flush_levels)
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+
+        self._lock = threading.Lock()
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._file = open(file_path, 'a', encoding="utf-8")
+        self._size = self._file.tell()
+        self._opened_at = time.monotonic()
+        self._compressors: list[threading.Thread] = []
+        # Имена сегментов, которые сейчас сжимаются
+        self._compressing: set[str] = set()
+        self._closed = False
+        self.dropped = 0
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, name="BufferedFileHandler", daemon=True)
+            self._flusher.start()
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        self.handle_batch([(log_level, text)])
+
+    def handle_batch(self, records: list[tuple[LogLevel, str]]) -> None:
+        with self._lock:
+            # После close файл закрыт: записи не теряются молча, а учитываются в dropped
+            if self._closed:
+                self.dropped += len(records)
+                return
+            if self._should_rotate():
+                self._rotate()
+            urgent = False
+            for log_level, text in records:
+                line = text + "\n"
+                size = len(line.encode("utf-8"))
+                # Ротация до записи, которая вывела бы сегмент за max_bytes
+                pending = self._size + self._buffered
+                if self.max_bytes is not None and pending and pending + size > self.max_bytes:
+                    self._rotate()
+                self._buffer.append(line)
+                self._buffered += size
+                urgent = urgent or log_level in self.flush_levels
+            if urgent or self._buffered >= self.buffer_bytes:
+                self._flush_buffer()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._flush_buffer()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._flush_buffer()
+            self._file.close()
+        for thread in self._compressors:
+            thread.join()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                if self._buffer:
+                    self._flush_buffer()
+                if self._should_rotate():
+                    self._rotate()
+
+    def _flush_buffer(self) -> None:
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._size += self._buffered
+            self._buffer.clear()
+            self._buffered = 0
+        self._file.flush()
+
+    # Ротация по времени; по размеру сегмент ротируется в handle_batch
+    def _should_rotate(self) -> bool:
+        if self.rotate_interval is not None and time.monotonic() - self._opened_at >= self.rotate_interval:
+            return self._size + self._buffered > 0
+        return False
+
+    def _rotate(self) -> None:
+        self._flush_buffer()
+        self._file.close()
+
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        rotated, n = f"{self.file_path}.{stamp}", 0
+        # Несколько ротаций за одну микросекунду не должны затирать друг друга
+        while os.path.exists(rotated) or os.path.exists(rotated + ".gz"):
+            n += 1
+            rotated = f"{self.file_path}.{stamp}-{n}"
+        os.replace(self.file_path, rotated)
+        self._file = open(self.file_path, 'a', encoding="utf-8")
+        self._size = 0
+        self._opened_at = time.monotonic()
+
+        self._compressors = [thread for thread in self._compressors if thread.is_alive()]
+        if self.compress:
+            self._compressing.add(os.path.basename(rotated))
+            thread = threading.Thread(target=self._compress_segment, args=(rotated,), daemon=True)
+            thread.start()
+            self._compressors.append(thread)
+        else:
+            self._remove_old_segments()
+
+    def _compress_segment(self, path: str) -> None:
+        try:
+            with open(path, 'rb') as src, gzip.open(path + ".gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except Exception as e:
+            print(f"BufferedFileHandler couldn`t compress {path}: {e}")
+        with self._lock:
+            self._compressing.discard(os.path.basename(path))
+            self._remove_old_segments()
+
+    # Вызывается под self._lock
+    def _remove_old_segments(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        prefix = os.path.basename(self.file_path) + "."
+        # Пока сегмент сжимается, на диске есть и X, и X.gz - это один сегмент
+        segments = sorted({name.removesuffix(".gz") for name in os.listdir(directory) if name.startswith(prefix)})
+        for name in segments[:max(0, len(segments) - self.backup_count)]:
+            # Сжимаемый сегмент удалит его поток, когда закончит сжатие
+            if name in self._compressing:
+                continue
+            for path in (name, name + ".gz"):
+                try:
+                    os.remove(os.path.join(directory, path))
+                except FileNotFoundError:
+                    pass
+
 class SocketHandler(LogHandlerProtocol):
     def __init__(self, host: str, port: str) -> None:
         self.host = host
@@ -74,6 +446,129 @@ class SocketHandler(LogHandlerProtocol):
             pass
 
 
+# Долгоживущее TCP-соединение: записи с префиксом длины (4 байта, big-endian) копятся в буфере
+# и уходят пачкой одним sendall из фонового потока; при обрыве - переподключение с нарастающей паузой
+class BatchingSocketHandler(LogHandlerProtocol):
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            max_buffer: int = 100000,
+            batch_size: int = 512,
+            connect_timeout: float = 5.0,
+            backoff_initial: float = 0.1,
+            backoff_max: float = 10.0,
+            flush_timeout: float = 5.0
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.connect_timeout = connect_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.flush_timeout = flush_timeout
+        self.dropped = 0
+        self.reconnects = 0
+
+        self._buffer: deque[bytes] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._socket: socket.socket | None = None
+        self._sender = threading.Thread(target=self._run, name="BatchingSocketHandler", daemon=True)
+        self._sender.start()
+
+    @staticmethod
+    def frame(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return struct.pack(">I", len(data)) + data
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        self.handle_batch([(log_level, text)])
+
+    def handle_batch(self, records: list[tuple[LogLevel, str]]) -> None:
+        frames = [self.frame(text) for _, text in records]
+        with self._condition:
+            self._buffer.extend(frames)
+            self._trim()
+            self._condition.notify_all()
+
+    # Пока соединения нет, в памяти держится не больше max_buffer записей, старые отбрасываются
+    def _trim(self) -> None:
+        while len(self._buffer) > self.max_buffer:
+            self._buffer.popleft()
+            self.dropped += 1
+
+    def _connect(self) -> bool:
+        try:
+            self._socket = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return True
+        except OSError:
+            self._socket = None
+            return False
+
+    def _disconnect(self) -> None:
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def _run(self) -> None:
+        backoff = self.backoff_initial
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer:
+                    break
+
+            if self._socket is None and not self._connect():
+                with self._condition:
+                    if self._closed:
+                        # Сервер недоступен при закрытии - оставшиеся записи теряются
+                        self.dropped += len(self._buffer)
+                        self._buffer.clear()
+                        self._condition.notify_all()
+                        break
+                    # Новые записи будят поток, но не сокращают паузу до следующей попытки
+                    next_attempt = time.monotonic() + backoff
+                    self._condition.wait_for(lambda: self._closed or time.monotonic() >= next_attempt, backoff)
+                backoff = min(backoff * 2, self.backoff_max)
+                continue
+            backoff = self.backoff_initial
+
+            with self._condition:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._in_flight = len(batch)
+            try:
+                self._socket.sendall(b"".join(batch))
+            except OSError:
+                self._disconnect()
+                self.reconnects += 1
+                with self._condition:
+                    self._buffer.extendleft(reversed(batch))
+                    self._trim()
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+        self._disconnect()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        timeout = self.flush_timeout if timeout is None else timeout
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._buffer and not self._in_flight, timeout)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._sender.join()
+
 class ConsoleHandler(LogHandlerProtocol):
     def handle(self, log_level: LogLevel, text: str) -> None:
         print(text)
@@ -94,30 +589,175 @@ class SyslogHandler(LogHandlerProtocol):
            print(f"Syslog couldn`t write file: {e}")
            pass
 
+# Пакетная отправка логов по FTP: записи копятся в локальных файлах-сегментах,
+# закрытые сегменты загружаются фоновым потоком через одну переиспользуемую сессию
 class FtpHandler(LogHandlerProtocol):
-    def __init__(self, host: str, username: str, password: str) -> None:
+    def __init__(
+            self,
+            host: str,
+            username: str,
+            password: str,
+            remote_dir: str = "/logs",
+            spool_dir: str | None = None,
+            segment_records: int = 1000,
+            segment_bytes: int = 1024 * 1024,
+            segment_age: float = 60.0,
+            max_retries: int = 5,
+            retry_delay: float = 1.0,
+            ftp_factory=FTP
+    ) -> None:
         self.host       = host
         self.username   = username
         self.password   = password
+        self.remote_dir = remote_dir
+        self.spool_dir  = spool_dir or self.default_spool_dir(host, username, remote_dir)
+        self.segment_records = segment_records
+        self.segment_bytes   = segment_bytes
+        self.segment_age     = segment_age
+        self.max_retries     = max_retries
+        self.retry_delay     = retry_delay
+        self.ftp_factory     = ftp_factory
+        self.uploaded = 0
+        self.failed_attempts = 0
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+        self._prefix = f"log_{socket.gethostname()}_{os.getpid()}"
+        self._sequence = 0
+        self._segment = None
+        self._segment_path = ""
+        self._segment_records = 0
+        self._segment_size = 0
+        self._segment_opened = 0.0
+
+        self._condition = threading.Condition()
+        self._ready: deque[str] = deque(
+            os.path.join(self.spool_dir, name) for name in sorted(os.listdir(self.spool_dir)) if name.endswith(".txt")
+        )
+        self._uploading = False
+        self._closed = False
+        self._ftp = None
+        self._uploader = threading.Thread(target=self._run, name="FtpHandler", daemon=True)
+        self._uploader.start()
+
+    # Каталог по умолчанию зависит только от локального пользователя и адресата отправки,
+    # поэтому следующий запуск с теми же параметрами найдет неотправленные сегменты
+    @staticmethod
+    def default_spool_dir(host: str, username: str, remote_dir: str) -> str:
+        name = re.sub(r"[^\w.-]", "_", f"{getpass.getuser()}_{username}_{host}_{remote_dir}")
+        return os.path.join(tempfile.gettempdir(), f"ftp_spool_{name}")
 
-        
     def handle(self, log_level: LogLevel, text: str) -> None:
-        try:
-            with tempfile.NamedTemporaryFile("w+", encoding="utf-8", delete=False) as tmp:
-                tmp.write(text)
-                tmp.flush()
-                tmp_name = tmp.name
-
-            ftp = FTP(self.host)
+        self.handle_batch([(log_level, text)])
+
+    def handle_batch(self, records: list[tuple[LogLevel, str]]) -> None:
+        data = "".join(text + "\n" for _, text in records).encode("utf-8")
+        with self._condition:
+            if self._segment is None:
+                self._open_segment()
+            self._segment.write(data)
+            self._segment_records += len(records)
+            self._segment_size += len(data)
+            if self._segment_records >= self.segment_records or self._segment_size >= self.segment_bytes:
+                self._seal_segment()
+
+    # Уникальное имя: хост, pid, время создания и порядковый номер сегмента
+    def _open_segment(self) -> None:
+        self._sequence += 1
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._segment_path = os.path.join(self.spool_dir, f"{self._prefix}_{stamp}_{self._sequence:06d}.txt")
+        self._segment = open(self._segment_path + ".part", 'wb')
+        self._segment_records = 0
+        self._segment_size = 0
+        self._segment_opened = time.monotonic()
+
+    def _seal_segment(self) -> None:
+        if self._segment is None:
+            return
+        self._segment.close()
+        self._segment = None
+        os.replace(self._segment_path + ".part", self._segment_path)
+        self._ready.append(self._segment_path)
+        self._condition.notify_all()
+
+    def _session(self):
+        if self._ftp is None:
+            ftp = self.ftp_factory(self.host)
             ftp.login(self.username, self.password)
-            ftp.cwd("/logs")
-
-            with open(tmp_name, 'rb') as f:
-                ftp.storbinary(f"STOR log_{os.path.basename}.txt", f)
-            ftp.quit()
-            os.remove(tmp_name)
-        except Exception as e:
-           pass
+            ftp.cwd(self.remote_dir)
+            self._ftp = ftp
+        return self._ftp
+
+    def _drop_session(self) -> None:
+        if self._ftp is not None:
+            try:
+                self._ftp.close()
+            except Exception as e:
+                pass
+            self._ftp = None
+
+    def _upload(self, path: str) -> bool:
+        for attempt in range(self.max_retries):
+            # Сегмент из общего spool_dir уже отправил другой экземпляр
+            if not os.path.exists(path):
+                return True
+            try:
+                with open(path, 'rb') as f:
+                    self._session().storbinary(f"STOR {os.path.basename(path)}", f)
+                os.remove(path)
+                self.uploaded += 1
+                return True
+            except Exception as e:
+                self.failed_attempts += 1
+                self._drop_session()
+                with self._condition:
+                    if self._closed and attempt == self.max_retries - 1:
+                        break
+                    self._condition.wait(self.retry_delay * 2 ** attempt)
+        return False
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._ready and not self._closed:
+                    timed_out = not self._condition.wait(self.segment_age)
+                    if timed_out and self._segment is not None \
+                            and time.monotonic() - self._segment_opened >= self.segment_age:
+                        self._seal_segment()
+                if not self._ready:
+                    break
+                path = self._ready.popleft()
+                self._uploading = True
+
+            uploaded = self._upload(path)
+            with self._condition:
+                self._uploading = False
+                if not uploaded:
+                    if self._closed:
+                        # Сегмент остается в spool_dir: его отправит следующий FtpHandler с тем же spool_dir
+                        # (по умолчанию - тот же пользователь, хост, логин и remote_dir)
+                        self._condition.notify_all()
+                        break
+                    self._ready.append(path)
+                self._condition.notify_all()
+
+        if self._ftp is not None:
+            try:
+                self._ftp.quit()
+            except Exception as e:
+                pass
+            self._ftp = None
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            self._seal_segment()
+            return self._condition.wait_for(lambda: not self._ready and not self._uploading, timeout)
+
+    def close(self) -> None:
+        with self._condition:
+            self._seal_segment()
+            self._closed = True
+            self._condition.notify_all()
+        self._uploader.join()
 
 
 # FORMATTERS ====================================
@@ -132,82 +772,216 @@ class LevelAndTimeFormatter(LogFormatterProtocol):
         data = now.strftime("%Y.%m.%d %H:%M:%S")
         return f"[{log_level}][data:{data}] {text}"
 
+# Тот же формат, что у LevelAndTimeFormatter, но строка времени пересчитывается раз в секунду
+class CachedTimeFormatter(LogFormatterProtocol):
+    def __init__(self) -> None:
+        self._prefixes = {log_level: f"[{log_level}][data:" for log_level in LogLevel}
+        self._cache = (-1, "")
+
+    def format(self, log_level: LogLevel, text: str) -> str:
+        second = int(time.time())
+        cached_second, data = self._cache
+        if second != cached_second:
+            data = datetime.fromtimestamp(second).strftime("%Y.%m.%d %H:%M:%S")
+            self._cache = (second, data)
+        return f"{self._prefixes[log_level]}{data}] {text}"
+
 
 # LOGGER ========================================
 class Logger():
     def __init__(self, filters: list[LogFilterProtocol], handlers: list[LogHandlerProtocol], formatters: list[LogFormatterProtocol]) -> None:
-        self.filters = filters
         self.handlers = handlers
         self.formatters = formatters
+        self.filter_chain = FilterChain(filters)
+
+    # Фильтры меняются через add_log_filter / remove_log_filter
+    @property
+    def filters(self) -> tuple[LogFilterProtocol, ...]:
+        return self.filter_chain.filters
     
-    def log(self, log_level: LogLevel, text: str) -> None:
-        if not all(filter.match(log_level, text) for filter in self.filters):
+    def is_enabled(self, log_level: LogLevel) -> bool:
+        return log_level in self.filter_chain.enabled_levels
+
+    # Аргументы подставляются в text (как text % args) только для включенного уровня
+    def log(self, log_level: LogLevel, text: str, *args) -> None:
+        if not self.filter_chain.match_level(log_level):
+            return
+        if args:
+            text = text % args
+        if not self.filter_chain.match_content(log_level, text):
             return
         
         for formatter in self.formatters:
             text = formatter.format(log_level, text)
         
+        self._emit(log_level, text)
+
+    def _emit(self, log_level: LogLevel, text: str) -> None:
         for handler in self.handlers:
             handler.handle(log_level, text)
         
-    def log_info(self, text: str) -> None:
-        self.log(LogLevel.INFO, text)
+    def log_info(self, text: str, *args) -> None:
+        self.log(LogLevel.INFO, text, *args)
     
-    def log_warn(self, text: str) -> None:
-        self.log(LogLevel.WARN, text)
+    def log_warn(self, text: str, *args) -> None:
+        self.log(LogLevel.WARN, text, *args)
 
-    def log_error(self, text: str) -> None:
-        self.log(LogLevel.ERROR, text)
+    def log_error(self, text: str, *args) -> None:
+        self.log(LogLevel.ERROR, text, *args)
     
     def add_log_filter(self, log_filter: LogFilterProtocol) -> None:
-        self.log_filters.append(log_filter)
+        self.filter_chain.add(log_filter)
 
     def add_log_formatter(self, log_formatter: LogFormatterProtocol) -> None:
-        self.log_formatters.append(log_formatter)
+        self.formatters.append(log_formatter)
 
     def add_log_handler(self, log_handler: LogHandlerProtocol) -> None:
-        self.log_handlers.append(log_handler)
+        self.handlers.append(log_handler)
 
     def remove_log_filter(self, log_filter: LogFilterProtocol) -> None:
-        self.log_filters.remove(log_filter)
+        self.filter_chain.remove(log_filter)
 
     def remove_log_formatter(self, log_formatter: LogFormatterProtocol) -> None:
-        self.log_formatters.remove(log_formatter)
+        self.formatters.remove(log_formatter)
 
     def remove_log_handler(self, log_handler: LogHandlerProtocol) -> None:
-        self.log_handlers.remove(log_handler)
-
+        self.handlers.remove(log_handler)
+
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "BLOCK"
+    DROP_OLDEST = "DROP_OLDEST"
+    DROP_NEWEST = "DROP_NEWEST"
+
+
+# Асинхронный логгер: log() фильтрует, форматирует и только кладет запись в ограниченную очередь,
+# обработчики вызываются пачками в фоновом потоке
+class QueueLogger(Logger):
+    def __init__(
+            self,
+            filters: list[LogFilterProtocol],
+            handlers: list[LogHandlerProtocol],
+            formatters: list[LogFormatterProtocol],
+            maxsize: int = 10000,
+            overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+            batch_size: int = 256
+    ) -> None:
+        super().__init__(filters, handlers, formatters)
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.dropped = 0
+
+        self._queue: deque[tuple[LogLevel, str]] = deque()
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="QueueLogger", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def _emit(self, log_level: LogLevel, text: str) -> None:
+        with self._condition:
+            if self._closed:
+                self.dropped += 1
+                return
+            if len(self._queue) >= self.maxsize:
+                if self.overflow == OverflowPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.overflow == OverflowPolicy.DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+                    # close() мог разбудить ожидание, когда фоновый поток уже завершился
+                    if self._closed:
+                        self.dropped += 1
+                        return
+            self._queue.append((log_level, text))
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_flight = len(batch)
+                self._condition.notify_all()
+
+            for handler in self.handlers:
+                try:
+                    handler.handle_batch(batch)
+                except Exception as e:
+                    pass
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    # Ждет, пока фоновый поток обработает все записи, поставленные в очередь
+    def flush(self, timeout: float | None = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+
+    def close(self) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+        atexit.unregister(self.close)
+        for handler in self.handlers:
+            handler.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type | None,
+            exc_value: BaseException | None,
+            traceback: types.TracebackType | None
+    ) -> None:
+        self.close()
         
 
-# Фильтры
-filters = [
-    LevelFilter(LogLevel.WARN),        # только WARN
-    SimpleLogFilter("disk"),           # только если есть "disk"
-    ReLogFilter(r".*full.*")           # и содержит "full"
-]
-
-# Хэндлеры
-handlers = [
-    SyslogHandler(),
-    ConsoleHandler(),
-    FileHandler("log_demo_extended.txt")
-]
-
-# Форматтер
-formatters = [LevelAndTimeFormatter()]
-
-# Logger
-logger = Logger(filters, handlers, formatters)
-
-# Тестовые логи
-test_messages = [
-    (LogLevel.INFO, "disk space ok"),            # не пройдет (INFO)
-    (LogLevel.WARN, "disk almost full"),        # пройдет
-    (LogLevel.WARN, "disk usage high"),         # не пройдет (нет "full")
-    (LogLevel.WARN, "memory full"),             # не пройдет (нет "disk")
-    (LogLevel.ERROR, "disk almost full"),       # не пройдет (ERROR)
-    (LogLevel.WARN, "disk full backup"),        # пройдет
-]
-
-for level, msg in test_messages:
-    logger.log(level, msg)
\ No newline at end of file
+if __name__ == "__main__":
+    # Фильтры
+    filters = [
+        LevelFilter(LogLevel.WARN),        # только WARN
+        SimpleLogFilter("disk"),           # только если есть "disk"
+        ReLogFilter(r".*full.*")           # и содержит "full"
+    ]
+
+    # Хэндлеры
+    handlers = [
+        SyslogHandler(),
+        ConsoleHandler(),
+        FileHandler("log_demo_extended.txt")
+    ]
+
+    # Форматтер
+    formatters = [LevelAndTimeFormatter()]
+
+    # Logger
+    logger = Logger(filters, handlers, formatters)
+
+    # Тестовые логи
+    test_messages = [
+        (LogLevel.INFO, "disk space ok"),            # не пройдет (INFO)
+        (LogLevel.WARN, "disk almost full"),        # пройдет
+        (LogLevel.WARN, "disk usage high"),         # не пройдет (нет "full")
+        (LogLevel.WARN, "memory full"),             # не пройдет (нет "disk")
+        (LogLevel.ERROR, "disk almost full"),       # не пройдет (ERROR)
+        (LogLevel.WARN, "disk full backup"),        # пройдет
+    ]
+
+    for level, msg in test_messages:
+        logger.log(level, msg)
@@ -0,0 +1,575 @@
+import ftplib
+import gzip
+import os
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+import unittest
+
+from main import (
+    BatchingSocketHandler, BufferedFileHandler, CachedTimeFormatter, FilterChain, FtpHandler, KeywordLogFilter,
+    LevelAndTimeFormatter, LevelFilter, Logger, LogHandlerProtocol, LogLevel, OverflowPolicy,
+    QueueLogger, ReLogFilter, SimpleLogFilter,
+)
+
+
+# Локальный TCP-сервер вместо настоящего приемника логов: читает записи с префиксом длины
+class FramedLogServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, port: int = 0) -> None:
+        self.records: list[str] = []
+        self.connections = 0
+        self.received = threading.Condition()
+        super().__init__(("127.0.0.1", port), FramedLogRequestHandler)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        with self.received:
+            return self.received.wait_for(lambda: len(self.records) >= count, timeout)
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class FramedLogRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        with self.server.received:
+            self.server.connections += 1
+        while True:
+            header = self.rfile.read(4)
+            if len(header) < 4:
+                return
+            (length,) = struct.unpack(">I", header)
+            text = self.rfile.read(length).decode("utf-8")
+            with self.server.received:
+                self.server.records.append(text)
+                self.server.received.notify_all()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Обработчик, который держит фоновый поток QueueLogger, пока не открыт gate
+class GatedHandler(LogHandlerProtocol):
+    def __init__(self) -> None:
+        self.records: list[str] = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        self.started.set()
+        self.gate.wait(5)
+        self.records.append(text)
+
+
+class QueueLoggerTest(unittest.TestCase):
+    def fill(self, overflow: OverflowPolicy) -> tuple[QueueLogger, GatedHandler]:
+        handler = GatedHandler()
+        logger = QueueLogger([], [handler], [], maxsize=2, overflow=overflow, batch_size=1)
+        logger.log_info("0")
+        self.assertTrue(handler.started.wait(5))
+        for i in range(1, 5):
+            logger.log_info(str(i))
+        return logger, handler
+
+    def test_drop_newest(self):
+        logger, handler = self.fill(OverflowPolicy.DROP_NEWEST)
+        handler.gate.set()
+        logger.close()
+        self.assertEqual(handler.records, ["0", "1", "2"])
+        self.assertEqual(logger.dropped, 2)
+
+    def test_drop_oldest(self):
+        logger, handler = self.fill(OverflowPolicy.DROP_OLDEST)
+        handler.gate.set()
+        logger.close()
+        self.assertEqual(handler.records, ["0", "3", "4"])
+        self.assertEqual(logger.dropped, 2)
+
+    def test_block_waits_for_space(self):
+        handler = GatedHandler()
+        logger = QueueLogger([], [handler], [], maxsize=1, batch_size=1)
+        logger.log_info("0")
+        self.assertTrue(handler.started.wait(5))
+        logger.log_info("1")
+        producer = threading.Thread(target=logger.log_info, args=("2",))
+        producer.start()
+        producer.join(0.1)
+        self.assertTrue(producer.is_alive())
+
+        handler.gate.set()
+        producer.join(5)
+        self.assertTrue(logger.flush(timeout=5))
+        logger.close()
+        self.assertEqual(handler.records, ["0", "1", "2"])
+        self.assertEqual(logger.dropped, 0)
+
+    def test_block_woken_by_close_counts_drop(self):
+        handler = GatedHandler()
+        logger = QueueLogger([], [handler], [], maxsize=1, batch_size=1)
+        logger.log_info("0")
+        self.assertTrue(handler.started.wait(5))
+        logger.log_info("1")
+        producer = threading.Thread(target=logger.log_info, args=("2",))
+        producer.start()
+        producer.join(0.1)
+
+        closer = threading.Thread(target=logger.close)
+        closer.start()
+        producer.join(5)
+        self.assertFalse(producer.is_alive())
+        handler.gate.set()
+        closer.join(5)
+        self.assertEqual(handler.records, ["0", "1"])
+        self.assertEqual(logger.dropped, 1)
+
+    def test_flush_and_close_drain(self):
+        handler = RecordingHandler()
+        with QueueLogger([], [handler], [], batch_size=16) as logger:
+            for i in range(100):
+                logger.log_warn("record %d", i)
+            self.assertTrue(logger.flush(timeout=5))
+            self.assertEqual(len(handler.records), 100)
+            for i in range(100, 200):
+                logger.log_warn("record %d", i)
+        self.assertEqual(handler.records, [(LogLevel.WARN, f"record {i}") for i in range(200)])
+        self.assertEqual(logger.dropped, 0)
+
+
+class BufferedFileHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "app.log")
+
+    def segments(self) -> list[str]:
+        names = sorted(name for name in os.listdir(self.directory.name) if name.startswith("app.log."))
+        return [os.path.join(self.directory.name, name) for name in names]
+
+    def read(self, path: str) -> str:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, 'rt', encoding="utf-8") as f:
+            return f.read()
+
+    def test_size_rotation_keeps_limit(self):
+        handler = BufferedFileHandler(self.path, flush_interval=None, max_bytes=200, backup_count=100)
+        records = [f"record number {i:03d}" for i in range(100)]
+        for text in records:
+            handler.handle(LogLevel.INFO, text)
+        handler.close()
+
+        paths = self.segments() + [self.path]
+        self.assertTrue(all(os.path.getsize(path) <= 200 for path in paths))
+        self.assertEqual("".join(self.read(path) for path in paths).splitlines(), records)
+
+    def test_error_flushes_immediately(self):
+        handler = BufferedFileHandler(self.path, flush_interval=None)
+        try:
+            handler.handle(LogLevel.INFO, "info")
+            self.assertEqual(self.read(self.path), "")
+            handler.handle(LogLevel.ERROR, "error")
+            self.assertEqual(self.read(self.path), "info\nerror\n")
+        finally:
+            handler.close()
+
+    def test_backup_count(self):
+        handler = BufferedFileHandler(self.path, flush_interval=None, max_bytes=50, backup_count=2)
+        for i in range(100):
+            handler.handle(LogLevel.INFO, f"record {i}")
+        handler.close()
+
+        segments = self.segments()
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(self.read(self.path).splitlines()[-1], "record 99")
+
+    def test_compress(self):
+        handler = BufferedFileHandler(self.path, flush_interval=None, max_bytes=50, backup_count=100, compress=True)
+        records = [f"record {i}" for i in range(20)]
+        for text in records:
+            handler.handle(LogLevel.INFO, text)
+        handler.close()
+
+        segments = self.segments()
+        self.assertTrue(segments)
+        self.assertTrue(all(path.endswith(".gz") for path in segments))
+        self.assertEqual("".join(self.read(path) for path in segments + [self.path]).splitlines(), records)
+
+    def test_close_twice(self):
+        handler = BufferedFileHandler(self.path)
+        handler.handle(LogLevel.INFO, "text")
+        handler.close()
+        handler.close()
+        handler.flush()
+        self.assertEqual(self.read(self.path), "text\n")
+
+    def test_records_after_close_are_counted(self):
+        handler = BufferedFileHandler(self.path, flush_interval=None)
+        handler.handle(LogLevel.INFO, "text")
+        handler.close()
+        handler.handle(LogLevel.ERROR, "late")
+        handler.handle_batch([(LogLevel.INFO, "later"), (LogLevel.INFO, "latest")])
+        self.assertEqual(handler.dropped, 3)
+        self.assertEqual(self.read(self.path), "text\n")
+
+    def test_backup_count_while_compressing(self):
+        # Сжатие сегмента с "record 03" задерживается: пока рядом лежат X и X.gz,
+        # ротации и сжатия других сегментов не должны удалять лишние сегменты
+        release = threading.Event()
+        done = threading.Semaphore(0)
+
+        class SlowCompressHandler(BufferedFileHandler):
+            def _compress_segment(self, path: str) -> None:
+                with open(path, 'r', encoding="utf-8") as f:
+                    slow = f.read() == "record 03\n"
+                if slow:
+                    with open(path + ".gz", 'wb'):
+                        pass
+                    release.wait(5)
+                super()._compress_segment(path)
+                if not slow:
+                    done.release()
+
+        handler = SlowCompressHandler(self.path, flush_interval=None, max_bytes=10, backup_count=3, compress=True)
+        try:
+            for i in range(5):
+                handler.handle(LogLevel.INFO, f"record {i:02d}")
+            for _ in range(3):
+                self.assertTrue(done.acquire(timeout=5))
+            handler.handle(LogLevel.INFO, "record 05")
+            self.assertTrue(done.acquire(timeout=5))
+        finally:
+            release.set()
+            handler.close()
+
+        segments = self.segments()
+        self.assertEqual(len(segments), 3)
+        self.assertTrue(all(path.endswith(".gz") for path in segments))
+        self.assertEqual("".join(self.read(path) for path in segments + [self.path]).splitlines(),
+                         ["record 02", "record 03", "record 04", "record 05"])
+
+
+class BatchingSocketHandlerTest(unittest.TestCase):
+    def test_frame(self):
+        self.assertEqual(BatchingSocketHandler.frame("привет"), b"\x00\x00\x00\x0c" + "привет".encode("utf-8"))
+
+    def test_many_records_over_one_connection(self):
+        server = FramedLogServer()
+        handler = BatchingSocketHandler("127.0.0.1", server.port, batch_size=100)
+        try:
+            for i in range(5000):
+                handler.handle(LogLevel.INFO, f"record {i}")
+            self.assertTrue(handler.flush())
+            self.assertTrue(server.wait_for(5000))
+        finally:
+            handler.close()
+            server.stop()
+
+        self.assertEqual(server.records, [f"record {i}" for i in range(5000)])
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_buffers_until_server_is_up(self):
+        port = free_port()
+        handler = BatchingSocketHandler("127.0.0.1", port, backoff_initial=0.01, backoff_max=0.05)
+        server = None
+        try:
+            handler.handle_batch([(LogLevel.WARN, "first"), (LogLevel.ERROR, "second")])
+            self.assertFalse(handler.flush(timeout=0.1))
+
+            server = FramedLogServer(port)
+            self.assertTrue(server.wait_for(2))
+            self.assertEqual(server.records, ["first", "second"])
+        finally:
+            handler.close()
+            if server is not None:
+                server.stop()
+
+    def test_backoff_while_records_arrive(self):
+        class CountingHandler(BatchingSocketHandler):
+            connects = 0
+
+            def _connect(self) -> bool:
+                self.connects += 1
+                return super()._connect()
+
+        handler = CountingHandler("127.0.0.1", free_port(), backoff_initial=0.2, backoff_max=0.2)
+        try:
+            deadline = time.monotonic() + 1.0
+            while time.monotonic() < deadline:
+                handler.handle(LogLevel.INFO, "record")
+                time.sleep(0.001)
+        finally:
+            handler.close()
+        self.assertLessEqual(handler.connects, 8)
+
+    def test_buffer_cap_drops_oldest(self):
+        handler = BatchingSocketHandler("127.0.0.1", free_port(), max_buffer=3, backoff_initial=10)
+        try:
+            handler.handle_batch([(LogLevel.INFO, str(i)) for i in range(10)])
+            with handler._condition:
+                buffered = [frame[4:].decode("utf-8") for frame in handler._buffer]
+        finally:
+            handler.close()
+
+        self.assertEqual(buffered, ["7", "8", "9"])
+        self.assertEqual(handler.dropped, 10)
+
+
+# Заглушка FTP-сервера: хранит загруженные файлы в памяти и считает сессии
+class FakeFtpServer:
+    def __init__(self, fail_uploads: int = 0) -> None:
+        self.files: dict[str, bytes] = {}
+        self.sessions = 0
+        self.logins = 0
+        self.fail_uploads = fail_uploads
+        self.lock = threading.Lock()
+
+    def connect(self, host: str) -> "FakeFtpSession":
+        with self.lock:
+            self.sessions += 1
+        return FakeFtpSession(self)
+
+
+class FakeFtpSession:
+    def __init__(self, server: FakeFtpServer) -> None:
+        self.server = server
+        self.directory = "/"
+
+    def login(self, username: str, password: str) -> None:
+        if (username, password) != ("user", "secret"):
+            raise ftplib.error_perm("530 Login incorrect")
+        with self.server.lock:
+            self.server.logins += 1
+
+    def cwd(self, path: str) -> None:
+        self.directory = path
+
+    def storbinary(self, command: str, f) -> None:
+        with self.server.lock:
+            if self.server.fail_uploads:
+                self.server.fail_uploads -= 1
+                raise ftplib.error_temp("421 Service not available")
+            name = command.removeprefix("STOR ")
+            self.server.files[f"{self.directory}/{name}"] = f.read()
+
+    def quit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FtpHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.spool = tempfile.TemporaryDirectory()
+        self.addCleanup(self.spool.cleanup)
+
+    def make_handler(self, server: FakeFtpServer, **kwargs) -> FtpHandler:
+        return FtpHandler("ftp.local", "user", "secret", spool_dir=self.spool.name,
+                          ftp_factory=server.connect, **kwargs)
+
+    def test_segments_over_one_session(self):
+        server = FakeFtpServer()
+        handler = self.make_handler(server, segment_records=100)
+        try:
+            for i in range(1000):
+                handler.handle(LogLevel.INFO, f"record {i}")
+            self.assertTrue(handler.flush(timeout=5))
+        finally:
+            handler.close()
+
+        self.assertEqual(len(server.files), 10)
+        self.assertEqual(server.sessions, 1)
+        self.assertEqual(server.logins, 1)
+        self.assertTrue(all(name.startswith("/logs/log_") and name.endswith(".txt") for name in server.files))
+        lines = b"".join(server.files[name] for name in sorted(server.files)).decode("utf-8").splitlines()
+        self.assertEqual(lines, [f"record {i}" for i in range(1000)])
+        self.assertEqual(os.listdir(self.spool.name), [])
+
+    def test_retry_reconnects(self):
+        server = FakeFtpServer(fail_uploads=2)
+        handler = self.make_handler(server, retry_delay=0.01)
+        try:
+            handler.handle_batch([(LogLevel.ERROR, "first"), (LogLevel.WARN, "second")])
+            self.assertTrue(handler.flush(timeout=5))
+        finally:
+            handler.close()
+
+        self.assertEqual(list(server.files.values()), [b"first\nsecond\n"])
+        self.assertEqual(server.sessions, 3)
+        self.assertEqual(handler.failed_attempts, 2)
+
+    def test_failed_segment_stays_in_spool(self):
+        server = FakeFtpServer(fail_uploads=100)
+        handler = self.make_handler(server, max_retries=2, retry_delay=0.01)
+        handler.handle(LogLevel.INFO, "kept")
+        handler.close()
+        self.assertEqual(server.files, {})
+        self.assertEqual(len(os.listdir(self.spool.name)), 1)
+
+        # Следующий запуск подхватывает оставшиеся сегменты
+        server.fail_uploads = 0
+        handler = self.make_handler(server)
+        try:
+            self.assertTrue(handler.flush(timeout=5))
+        finally:
+            handler.close()
+        self.assertEqual(list(server.files.values()), [b"kept\n"])
+
+    def test_default_spool_dir_is_stable(self):
+        old_tempdir = tempfile.tempdir
+        tempfile.tempdir = self.spool.name
+        self.addCleanup(setattr, tempfile, "tempdir", old_tempdir)
+
+        server = FakeFtpServer(fail_uploads=100)
+        handler = FtpHandler("ftp.local", "user", "secret", max_retries=1, ftp_factory=server.connect)
+        handler.handle(LogLevel.INFO, "kept")
+        handler.close()
+        self.assertEqual(os.path.dirname(handler.spool_dir), self.spool.name)
+        self.assertEqual(len(os.listdir(handler.spool_dir)), 1)
+
+        # Новый экземпляр без явного spool_dir находит сегмент предыдущего
+        server.fail_uploads = 0
+        handler = FtpHandler("ftp.local", "user", "secret", ftp_factory=server.connect)
+        try:
+            self.assertTrue(handler.flush(timeout=5))
+        finally:
+            handler.close()
+        self.assertEqual(list(server.files.values()), [b"kept\n"])
+        self.assertEqual(os.listdir(handler.spool_dir), [])
+
+
+class RecordingHandler(LogHandlerProtocol):
+    def __init__(self) -> None:
+        self.records: list[tuple[LogLevel, str]] = []
+
+    def handle(self, log_level: LogLevel, text: str) -> None:
+        self.records.append((log_level, text))
+
+
+class FilterChainTest(unittest.TestCase):
+    def test_level_filter_checked_first(self):
+        regex = ReLogFilter(r".*full.*")
+        simple = SimpleLogFilter("disk")
+        level = LevelFilter(LogLevel.WARN)
+        chain = FilterChain([regex, simple, level])
+        self.assertEqual([stats.log_filter for stats in chain.stats()], [level, simple, regex])
+
+        self.assertFalse(chain.match(LogLevel.INFO, "disk full"))
+        self.assertTrue(chain.match(LogLevel.WARN, "disk full"))
+        self.assertFalse(chain.match(LogLevel.WARN, "disk ok"))
+        counts = {type(stats.log_filter): (stats.evaluations, stats.rejections) for stats in chain.stats()}
+        self.assertEqual(counts[LevelFilter], (3, 1))
+        self.assertEqual(counts[SimpleLogFilter], (2, 0))
+        self.assertEqual(counts[ReLogFilter], (2, 1))
+
+    def test_reorders_by_selectivity(self):
+        common = SimpleLogFilter("record")
+        rare = SimpleLogFilter("needle")
+        chain = FilterChain([common, rare], sample_every=4, reorder_every=64)
+        for i in range(2000):
+            chain.match(LogLevel.INFO, f"record {i}")
+        # Первый фильтр ничего не отсеивает, поэтому вперед выходит редкий
+        self.assertIs(chain.stats()[0].log_filter, rare)
+        self.assertTrue(chain.match(LogLevel.INFO, "record needle"))
+        self.assertFalse(chain.match(LogLevel.INFO, "needle"))
+
+    def test_level_guard_counts(self):
+        level = LevelFilter(LogLevel.WARN)
+        simple = SimpleLogFilter("disk")
+        logger = Logger([simple, level], [], [])
+        for i in range(5000):
+            logger.log_info("disk %d", i)
+            logger.log_warn("disk %d", i)
+        counts = {type(stats.log_filter): (stats.evaluations, stats.rejections) for stats in logger.filter_chain.stats()}
+        self.assertEqual(counts[LevelFilter], (10000, 5000))
+        # Записи, прошедшие проверку уровня, LevelFilter повторно не проверяет
+        self.assertEqual(counts[SimpleLogFilter], (5000, 0))
+        self.assertEqual([stats.log_filter for stats in logger.filter_chain.stats()], [level, simple])
+
+    def test_logger_add_remove(self):
+        handler = RecordingHandler()
+        logger = Logger([], [handler], [])
+        level = LevelFilter(LogLevel.ERROR)
+        logger.add_log_filter(level)
+        logger.log_info("skipped")
+        logger.log_error("kept")
+        logger.remove_log_filter(level)
+        logger.log_info("after")
+        self.assertEqual(handler.records, [(LogLevel.ERROR, "kept"), (LogLevel.INFO, "after")])
+        self.assertEqual(logger.filters, ())
+
+    def test_filters_not_aliased(self):
+        filters = [SimpleLogFilter("disk")]
+        logger = Logger(filters, [], [])
+        filters.append(LevelFilter(LogLevel.ERROR))
+        self.assertTrue(logger.is_enabled(LogLevel.INFO))
+        with self.assertRaises(AttributeError):
+            logger.filters.append(LevelFilter(LogLevel.ERROR))
+
+
+class KeywordLogFilterTest(unittest.TestCase):
+    def test_overlapping_keywords(self):
+        log_filter = KeywordLogFilter(["he", "she", "his", "hers"])
+        self.assertEqual(log_filter.matches("ushers"), {"he", "she", "hers"})
+        self.assertTrue(log_filter.match(LogLevel.INFO, "ushers"))
+        self.assertFalse(log_filter.match(LogLevel.INFO, "ush"))
+
+    def test_many_keywords(self):
+        hosts = [f"host-{i:04d}" for i in range(5000)]
+        log_filter = KeywordLogFilter(hosts + ["E500"], ignore_case=True)
+        self.assertEqual(log_filter.matches("e500 from HOST-0042 via host-4999"), {"E500", "host-0042", "host-4999"})
+        self.assertEqual(log_filter.matches("host-5000"), set())
+        self.assertFalse(log_filter.match(LogLevel.ERROR, "all quiet"))
+
+
+class Exploding:
+    def __str__(self) -> str:
+        raise AssertionError("message formatted for a disabled level")
+
+
+class LazyLoggingTest(unittest.TestCase):
+    def test_is_enabled(self):
+        logger = Logger([LevelFilter(LogLevel.WARN), SimpleLogFilter("disk")], [], [])
+        self.assertTrue(logger.is_enabled(LogLevel.WARN))
+        self.assertFalse(logger.is_enabled(LogLevel.INFO))
+        logger.add_log_filter(LevelFilter(LogLevel.ERROR))
+        self.assertFalse(logger.is_enabled(LogLevel.WARN))
+        self.assertTrue(Logger([], [], []).is_enabled(LogLevel.INFO))
+
+    def test_deferred_arguments(self):
+        handler = RecordingHandler()
+        logger = Logger([LevelFilter(LogLevel.WARN), SimpleLogFilter("disk")], [handler], [])
+        logger.log_info("value %s", Exploding())
+        logger.log_warn("%s is %d%% full", "disk", 95)
+        logger.log_warn("%s is %d%% full", "memory", 80)
+        self.assertEqual(handler.records, [(LogLevel.WARN, "disk is 95% full")])
+
+    def test_cached_time_formatter_matches(self):
+        cached = CachedTimeFormatter()
+        plain = LevelAndTimeFormatter()
+        for _ in range(3):
+            expected = plain.format(LogLevel.ERROR, "text")
+            actual = cached.format(LogLevel.ERROR, "text")
+            if expected == actual:
+                break
+        self.assertEqual(actual, expected)
+        self.assertEqual(cached.format(LogLevel.INFO, "a")[:-1], cached.format(LogLevel.INFO, "b")[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()